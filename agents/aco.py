@@ -1,4 +1,5 @@
 import numpy as np
+from maze.dynamic_maze import MOVE_DIRECTIONS
 
 class ACOBehavior:
     """Handles Ant Colony Optimization behavior for agents."""
@@ -7,24 +8,101 @@ class ACOBehavior:
         # Default config values - simplified
         self.config = {
             'pheromone_strength': 0.6,  # base intensity of pheromone deposits
-            'max_pheromone': 1.0,       # upper limit for pheromone concentration
+            'max_pheromone': 1.0,       # unused: 'default' doesn't clip, and 'mmas'
+                                        # clips to tau_max instead
             'goal_influence': 5.0,      # weight of goal-directed behavior
             'pheromone_influence': 0.4,  # weight of pheromone trail following
-            'backtrack_penalty': 0.1    # multiplier to discourage reversing direction
+            'backtrack_penalty': 0.1,   # multiplier to discourage reversing direction
+            # only used when the maze has a ClusterHierarchy
+            'hierarchy_influence': 40.0,         # weight of moving closer by the coarse distance
+            'cluster_pheromone_influence': 0.1,  # weight of cluster-level pheromone
+            # only used when the maze has a DeadEndIndex
+            'dead_end_penalty': 0.0,    # multiplier for moves deeper into a dead end
+            # only used when the maze has a JunctionGraph
+            'revisit_penalty': 0.5,     # multiplier per earlier visit to a corridor's end
+            # pheromone update rule: 'default', or 'mmas' for MAX-MIN Ant System
+            'update_rule': 'default',
+            # only used by 'mmas'
+            'tau_max': None,            # upper trail bound (None: see pheromone_bounds)
+            'tau_min': None,            # lower trail bound (None: tau_max / 50)
+            'elitist_deposit': None,    # laid along a path on arrival, spread over its
+                                        # length (None: 10 * tau_max)
+            'stagnation_reset_ticks': None,  # reset trails after the best path is this stable
         }
         # Allow custom config to override defaults
         if config:
             self.config.update(config)
             
-    def leave_pheromone(self, agent, maze_grid):
-        """Leave pheromone trail as agent moves."""
+    def pheromone_bounds(self):
+        """(tau_min, tau_max) trail bounds, or None if the rule has none.
+        
+        By default a full trail weighs as much in a move's score as the
+        difference between stepping toward and away from the goal, so
+        the trail can overrule the goal heuristic but never swamp it.
+        """
+        if self.config['update_rule'] != 'mmas':
+            return None
+        tau_max = self.config['tau_max']
+        if tau_max is None:
+            tau_max = (2.0 - 0.5) * self.config['goal_influence'] / self.config['pheromone_influence']
+        tau_min = self.config['tau_min']
+        return (tau_max / 50 if tau_min is None else tau_min, tau_max)
+            
+    def leave_pheromone(self, agent, maze_grid, deposits=None):
+        """Leave pheromone trail as agent moves.
+        
+        If a deposits list is given the (y, x, strength) deposits are
+        appended to it instead of being written to the grid.
+        """
         if hasattr(maze_grid, 'pheromone_grid'):
             # Scale pheromone by progress toward goal
             # More progress = stronger pheromone trail to reinforce good paths
             progress = 1 - (agent.current_distance / agent.initial_distance)
             strength = self.config['pheromone_strength'] * progress
             # Deposit pheromone at agent's current position
-            maze_grid.pheromone_grid[agent.y, agent.x] += strength
+            cells = [(agent.y, agent.x, strength)]
+            
+            # MAX-MIN: reinforce the whole path once it reaches the goal
+            if self.config['update_rule'] == 'mmas':
+                self._extend_trail(agent)
+                if agent.x == agent.goal_x and agent.y == agent.goal_y:
+                    cells.extend(self._elitist_deposits(agent))
+            
+            if deposits is not None:
+                deposits.extend(cells)
+                return
+            for y, x, cell_strength in cells:
+                maze_grid.pheromone_grid[y, x] += cell_strength
+                # Build up the coarse trail too
+                if getattr(maze_grid, 'hierarchy', None) is not None:
+                    maze_grid.hierarchy.deposit(y, x, cell_strength)
+            bounds = getattr(maze_grid, 'pheromone_bounds', None)
+            if bounds is not None:
+                ys, xs, _ = zip(*cells)
+                maze_grid.pheromone_grid[ys, xs] = np.clip(maze_grid.pheromone_grid[ys, xs], *bounds)
+    
+    def _extend_trail(self, agent):
+        """Add the agent's new cell to its trail, erasing any loop it closes."""
+        cell = (agent.x, agent.y)
+        index = agent.trail_index.get(cell)
+        if index is None:
+            agent.trail_index[cell] = len(agent.trail)
+            agent.trail.append(cell)
+            return
+        for looped in agent.trail[index + 1:]:
+            del agent.trail_index[looped]
+        del agent.trail[index + 1:]
+    
+    def _elitist_deposits(self, agent):
+        """Deposits along the agent's trail, inversely proportional to its length."""
+        steps = len(agent.trail) - 1
+        if steps < 1:
+            return []
+        total = self.config['elitist_deposit']
+        if total is None:
+            total = 10 * self.pheromone_bounds()[1]
+        strength = total / steps
+        return [(y, x, strength) for x, y in agent.trail]
             
     def follow_pheromones(self, agent, maze, temperature):
         """Calculate movement influence from pheromone trails."""
@@ -35,51 +113,108 @@ class ACOBehavior:
         moves = []  # stores possible (dx,dy) movement vectors
         values = [] # stores corresponding movement scores
         
-        # Check all four cardinal directions
-        for dx, dy in [(0,1), (1,0), (0,-1), (-1,0)]:  # right, down, left, up
+        # Coarse guidance on mazes with a cluster hierarchy
+        hierarchy = getattr(maze, 'hierarchy', None)
+        if hierarchy is not None:
+            here = hierarchy.goal_distance(agent.x, agent.y)
+        # Dead-end filling, so agents skip (and back out of) useless branches
+        dead_ends = getattr(maze, 'dead_ends', None)
+        in_dead_end = dead_ends is not None and dead_ends.order[agent.y, agent.x] > 0
+        
+        # Check all cardinal directions that don't hit walls
+        for dx, dy in agent._valid_moves(maze):
             new_x = agent.x + dx
             new_y = agent.y + dy
-            # Only consider moves that don't hit walls
-            if agent._is_valid_move(new_x, new_y, maze.grid):
-                moves.append((dx, dy))
-                
-                # Calculate move score based on:
-                # 1. Pheromone concentration at new position
-                # 2. Whether move brings agent closer to goal
-                value = (
-                    maze.pheromone_grid[new_y, new_x] * self.config['pheromone_influence'] +
-                    (2.0 if agent._is_closer_to_goal(new_x, new_y) else 0.5) * self.config['goal_influence']
+            moves.append((dx, dy))
+            
+            # Calculate move score based on:
+            # 1. Pheromone concentration at new position
+            # 2. Whether move brings agent closer to goal
+            value = (
+                maze.pheromone_grid[new_y, new_x] * self.config['pheromone_influence'] +
+                (2.0 if agent._is_closer_to_goal(new_x, new_y) else 0.5) * self.config['goal_influence']
+            )
+            
+            # 3. Coarse trail and goal distance from the cluster hierarchy
+            if hierarchy is not None:
+                value += (
+                    hierarchy.pheromone_at(new_x, new_y) * self.config['cluster_pheromone_influence'] +
+                    (1.0 if hierarchy.goal_distance(new_x, new_y) < here else 0.0) *
+                    self.config['hierarchy_influence']
                 )
+            
+            # Reduce score if move reverses previous direction
+            # (unless it backs out of a dead end)
+            if agent.vx == -dx and agent.vy == -dy and not in_dead_end:
+                value *= self.config['backtrack_penalty']
+            
+            # 4. Mask (or penalize) moves deeper into a dead end
+            if dead_ends is not None and dead_ends.is_useless_move(agent.x, agent.y, new_x, new_y):
+                value *= self.config['dead_end_penalty']
                 
-                # Reduce score if move reverses previous direction
-                if agent.vx == -dx and agent.vy == -dy:
-                    value *= self.config['backtrack_penalty']
-                    
-                # Add randomness scaled by temperature for exploration
-                # Higher temperature = more random exploration
-                value += np.random.random() * temperature * 2
-                
-                values.append(value)
+            # Add randomness scaled by temperature for exploration
+            # Higher temperature = more random exploration
+            value += agent.rng.random() * temperature * 2
+            
+            values.append(value)
         
         # If no valid moves found, stay in place
         if not moves:
             return 0, 0
             
         # Select the move with highest score
-        best_idx = np.argmax(values)
+        # (plain max on the short list; np.argmax would convert it to an array)
+        best_idx = values.index(max(values))
         return moves[best_idx]
         
+    def follow_junctions(self, agent, maze, temperature):
+        """Pick the corridor to take from the junction the agent stands on.
+        
+        Corridors are scored like single steps in follow_pheromones, by
+        their mean pheromone and by where they end. Returns the chosen
+        (direction, corridor) from maze.junctions, or None if there is none.
+        """
+        choices = list(maze.junctions.edges[(agent.x, agent.y)].items())
+        if not choices:
+            return None
+        values = []
+        
+        hierarchy = getattr(maze, 'hierarchy', None)
+        if hierarchy is not None:
+            here = hierarchy.goal_distance(agent.x, agent.y)
+        dead_ends = getattr(maze, 'dead_ends', None)
+        in_dead_end = dead_ends is not None and dead_ends.order[agent.y, agent.x] > 0
+        
+        for direction, (end, cells, index) in choices:
+            dx, dy = MOVE_DIRECTIONS[direction]
+            value = (
+                maze.pheromone_grid[index].mean() * self.config['pheromone_influence'] +
+                (2.0 if agent._is_closer_to_goal(*end) else 0.5) * self.config['goal_influence']
+            )
+            if hierarchy is not None:
+                value += (
+                    hierarchy.pheromone_at(*end) * self.config['cluster_pheromone_influence'] +
+                    (1.0 if hierarchy.goal_distance(*end) < here else 0.0) *
+                    self.config['hierarchy_influence']
+                )
+            # the way back along the corridor the agent came in by
+            if agent.vx == -dx and agent.vy == -dy and not in_dead_end:
+                value *= self.config['backtrack_penalty']
+            if dead_ends is not None and dead_ends.is_useless_move(agent.x, agent.y, *cells[0]):
+                value *= self.config['dead_end_penalty']
+            # steer away from junctions the agent keeps coming back to
+            value *= self.config['revisit_penalty'] ** agent.junction_visits.get(end, 0)
+            value += agent.rng.random() * temperature * 2
+            values.append(value)
+        
+        return choices[values.index(max(values))]
+        
     def _random_valid_move(self, agent, maze):
         """Choose random valid move for exploration."""
-        possible_moves = []
         # Check all cardinal directions for valid moves
-        for dx, dy in [(0,1), (1,0), (0,-1), (-1,0)]:
-            new_x = agent.x + dx
-            new_y = agent.y + dy
-            if agent._is_valid_move(new_x, new_y, maze.grid):
-                possible_moves.append((dx, dy))
+        possible_moves = agent._valid_moves(maze)
         
         # Return random valid move if available, otherwise stay in place
         if possible_moves:
-            return possible_moves[np.random.randint(len(possible_moves))]
+            return possible_moves[agent.rng.randint(len(possible_moves))]
         return 0, 0 
\ No newline at end of file
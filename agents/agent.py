@@ -1,5 +1,6 @@
 import numpy as np
 from .aco import ACOBehavior
+from maze.dynamic_maze import MOVE_DIRECTIONS, MASK_MOVES
 
 class Agent:
     """
@@ -26,6 +27,10 @@ class Agent:
         self.goal_y = goal_y
         self.vx = self.vy = 0
         
+        # Random source for exploration; the shared numpy one unless the
+        # simulation hands the agent its own stream
+        self.rng = np.random
+        
         # Temperature for simulated annealing
         self.temperature = self.config['initial_temperature']
         self.min_temperature = self.config['min_temperature']
@@ -34,11 +39,21 @@ class Agent:
         self.initial_distance = self._manhattan_distance(x, y, goal_x, goal_y)
         self.current_distance = self.initial_distance
         
+        # Cells walked since leaving the colony, loops erased (MAX-MIN only)
+        self.trail = [(x, y)]
+        self.trail_index = {(x, y): 0}
+        # Times each junction was reached by a corridor (junction moves only)
+        self.junction_visits = {}
+        # Cells walked through (not onto) during the last move
+        self.passed_cells = ()
+        
         # Initialize ACO behavior with ACO config if provided
         aco_config = self.config.get('aco', None)
         self.aco = ACOBehavior(aco_config)
         
-    def move(self, maze, agents, time_remaining):
+    def move(self, maze, agents, time_remaining, deposits=None):
+        """Take one step; pheromone goes to deposits instead of the grid if given."""
+        self.passed_cells = ()
         # Update temperature based on remaining time
         self.temperature = max(
             self.min_temperature,
@@ -53,20 +68,51 @@ class Agent:
             self.vx = self.vy = 0
             return
             
+        # On a junction of a contracted maze, take a whole corridor at once
+        junctions = getattr(maze, 'junctions', None)
+        if junctions is not None and (self.x, self.y) in junctions.edges:
+            choice = self.aco.follow_junctions(self, maze, self.temperature)
+            if choice is None:
+                self.vx = self.vy = 0
+            else:
+                self._traverse(choice, maze, deposits)
+            return
+            
         # Get movement from ACO behavior
         self.vx, self.vy = self.aco.follow_pheromones(self, maze, self.temperature)
         
         # Apply movement if valid
-        new_x = self.x + round(self.vx)
-        new_y = self.y + round(self.vy)
+        move = (round(self.vx), round(self.vy))
         
-        if self._is_valid_move(new_x, new_y, maze.grid):
-            self.x = new_x
-            self.y = new_y
-            self.aco.leave_pheromone(self, maze)
+        if move in self._valid_moves(maze):
+            self.x += move[0]
+            self.y += move[1]
+            self.aco.leave_pheromone(self, maze, deposits)
         else:
             self.vx = self.vy = 0
         
+    def _traverse(self, choice, maze, deposits=None):
+        """Walk a (direction, corridor) from maze.junctions to its end,
+        leaving pheromone on every cell along the way."""
+        _, (_, cells, _) = choice
+        self.passed_cells = cells[:-1]
+        for x, y in cells:
+            # deposits see the distance before each step, as single moves do
+            self.current_distance = self._manhattan_distance(self.x, self.y, self.goal_x, self.goal_y)
+            # velocity ends up as the last step, into the corridor's end
+            self.vx, self.vy = x - self.x, y - self.y
+            self.x, self.y = x, y
+            self.aco.leave_pheromone(self, maze, deposits)
+        self.junction_visits[(self.x, self.y)] = self.junction_visits.get((self.x, self.y), 0) + 1
+        
+    def _valid_moves(self, maze):
+        """Legal (dx, dy) moves from the agent's current cell."""
+        # One table lookup when the maze keeps a move mask
+        if hasattr(maze, 'move_mask'):
+            return MASK_MOVES[maze.move_mask[self.y, self.x]]
+        return [(dx, dy) for dx, dy in MOVE_DIRECTIONS
+                if self._is_valid_move(self.x + dx, self.y + dy, maze.grid)]
+        
     def _is_valid_move(self, x, y, maze_grid):
         """Check if position is valid and not a wall."""
         return (0 <= x < maze_grid.shape[1] and 
@@ -0,0 +1,178 @@
+import heapq
+from abc import ABC, abstractmethod
+from collections import deque
+from maze.dynamic_maze import MASK_MOVES, MOVE_DIRECTIONS
+
+"""
+Non-swarm baseline agents to measure the ACO agents against.
+
+They share Agent's constructor and move(maze, agents, time_remaining)
+interface, so Simulation can run them on the same DynamicMaze:
+- BFSAgent: shortest path by breadth-first search, replanned when a wall
+  opens anywhere or closes on or next to it
+- AStarAgent: shortest path by A* with a Manhattan heuristic, replanned the same way
+- WallFollowerAgent: keeps its right hand on the wall, no planning at all
+"""
+
+class PlanningAgent(ABC):
+    """Follows a planned path, planning again when wall changes may have
+    blocked it or opened a shorter one."""
+    def __init__(self, x, y, goal_x, goal_y, config=None):
+        self.config = config or {}
+        self.x = x
+        self.y = y
+        self.goal_x = goal_x
+        self.goal_y = goal_y
+        self.vx = self.vy = 0
+        # not annealing, but the HUD shows it
+        self.temperature = 0
+        
+        self.path = deque()         # (x, y) cells still to walk
+        self.planned_version = None  # maze.version the path was planned on
+        self.replans = 0            # plans after the first one
+        self.nodes_expanded = 0
+        
+    def move(self, maze, agents, time_remaining, deposits=None):
+        if self.x == self.goal_x and self.y == self.goal_y:
+            self.vx = self.vy = 0
+            return
+            
+        if self._needs_plan(maze):
+            if self.planned_version is not None:
+                self.replans += 1
+            self.path = deque(self._plan(maze))
+            self.planned_version = maze.version
+            
+        if not self.path or not self._next_step_open(maze):
+            # goal is cut off for now, wait for walls to change
+            self.vx = self.vy = 0
+            return
+        next_x, next_y = self.path.popleft()
+        self.vx, self.vy = next_x - self.x, next_y - self.y
+        self.x, self.y = next_x, next_y
+        
+    def _needs_plan(self, maze):
+        """Whether the path may have stopped being open or shortest."""
+        if self.planned_version is None:
+            return True
+        if maze.version != self.planned_version:
+            # changed_cells only covers the latest update, and an empty
+            # path may have become possible
+            if maze.version != self.planned_version + 1 or not self.path:
+                return True
+            if self._path_touched(maze, maze.changed_cells):
+                return True
+            self.planned_version = maze.version  # still the best path
+        return bool(self.path) and not self._next_step_open(maze)
+        
+    def _path_touched(self, maze, changed_cells):
+        """Whether the changes may have blocked or lengthened the path.
+        
+        Any opened wall can join two branches into a shortcut, however
+        far it is from the path, so it always counts. A closed wall only
+        counts on the remaining path or next to it.
+        """
+        path = set(self.path)
+        path.add((self.x, self.y))
+        for x, y in changed_cells:
+            if maze.grid[y, x] == 0:
+                return True
+            if (x, y) in path or any((x + dx, y + dy) in path for dx, dy in MOVE_DIRECTIONS):
+                return True
+        return False
+        
+    def _next_step_open(self, maze):
+        """Whether the first cell of the path is still reachable."""
+        if not self.path:
+            return False
+        next_x, next_y = self.path[0]
+        return (next_x - self.x, next_y - self.y) in MASK_MOVES[maze.move_mask[self.y, self.x]]
+        
+    @abstractmethod
+    def _plan(self, maze):
+        """Return the cells from (but excluding) the agent's cell to the goal."""
+        
+    def _unwind(self, parents, cell):
+        """Rebuild the path to cell from a search's parent links."""
+        path = []
+        while parents[cell] is not None:
+            path.append(cell)
+            cell = parents[cell]
+        path.reverse()
+        return path
+
+class BFSAgent(PlanningAgent):
+    def _plan(self, maze):
+        start, goal = (self.x, self.y), (self.goal_x, self.goal_y)
+        parents = {start: None}
+        queue = deque([start])
+        while queue:
+            cell = queue.popleft()
+            self.nodes_expanded += 1
+            if cell == goal:
+                return self._unwind(parents, cell)
+            x, y = cell
+            for dx, dy in MASK_MOVES[maze.move_mask[y, x]]:
+                neighbor = (x + dx, y + dy)
+                if neighbor not in parents:
+                    parents[neighbor] = cell
+                    queue.append(neighbor)
+        return []
+
+class AStarAgent(PlanningAgent):
+    def _plan(self, maze):
+        start, goal = (self.x, self.y), (self.goal_x, self.goal_y)
+        parents = {start: None}
+        costs = {start: 0}
+        frontier = [(self._heuristic(start), 0, start)]
+        while frontier:
+            _, cost, cell = heapq.heappop(frontier)
+            if cost > costs[cell]:
+                continue  # stale entry
+            self.nodes_expanded += 1
+            if cell == goal:
+                return self._unwind(parents, cell)
+            x, y = cell
+            for dx, dy in MASK_MOVES[maze.move_mask[y, x]]:
+                neighbor = (x + dx, y + dy)
+                if cost + 1 < costs.get(neighbor, float('inf')):
+                    costs[neighbor] = cost + 1
+                    parents[neighbor] = cell
+                    heapq.heappush(frontier, (cost + 1 + self._heuristic(neighbor), cost + 1, neighbor))
+        return []
+        
+    def _heuristic(self, cell):
+        return abs(cell[0] - self.goal_x) + abs(cell[1] - self.goal_y)
+
+class WallFollowerAgent:
+    """Right-hand rule: turn right if possible, else straight, left, back."""
+    # headings in clockwise order (screen coordinates, y grows downward)
+    HEADINGS = [(0,-1), (1,0), (0,1), (-1,0)]  # up, right, down, left
+    
+    def __init__(self, x, y, goal_x, goal_y, config=None):
+        self.config = config or {}
+        self.x = x
+        self.y = y
+        self.goal_x = goal_x
+        self.goal_y = goal_y
+        self.vx = self.vy = 0
+        self.temperature = 0
+        self.heading = 1  # start facing right, toward the goal side
+        self.replans = 0
+        self.nodes_expanded = 0
+        
+    def move(self, maze, agents, time_remaining, deposits=None):
+        if self.x == self.goal_x and self.y == self.goal_y:
+            self.vx = self.vy = 0
+            return
+            
+        open_moves = MASK_MOVES[maze.move_mask[self.y, self.x]]
+        for turn in (1, 0, -1, 2):  # right, straight, left, back
+            heading = (self.heading + turn) % 4
+            if self.HEADINGS[heading] in open_moves:
+                self.heading = heading
+                self.vx, self.vy = self.HEADINGS[heading]
+                self.x += self.vx
+                self.y += self.vy
+                return
+        self.vx = self.vy = 0
@@ -0,0 +1,139 @@
+import os
+import numpy as np
+from maze.dynamic_maze import MOVE_DIRECTIONS
+
+"""
+Preallocated trajectory recording for swarm analytics.
+
+TrajectoryRecorder keeps the last `window` ticks of every agent's position
+and move direction in numpy ring buffers that are preallocated, so memory
+stays fixed however long the run. Recording a tick only builds a few
+temporary per-agent arrays, never per-step Python objects that pile up.
+Whole-run statistics (visit counts, backtracks, arrival ticks) are
+accumulated as the ticks come in, and with a spill directory every full
+window is written to disk before it is overwritten.
+
+Directions are indices into MOVE_DIRECTIONS, with -1 for a tick the agent
+didn't move.
+
+With junction moves an agent can walk a whole corridor in one tick. The
+cells it passed on the way still count toward visit_counts, but the ring
+buffers, backtracks and loop_frequency() only see where it ended up each
+tick (and the direction of its last step), so they work at junction
+granularity.
+"""
+
+# direction index for a (dx, dy) velocity, looked up at (dx + 1) * 3 + (dy + 1)
+_VELOCITY_DIRECTION = np.full(9, -1, dtype=np.int8)
+for _index, (_dx, _dy) in enumerate(MOVE_DIRECTIONS):
+    _VELOCITY_DIRECTION[(_dx + 1) * 3 + (_dy + 1)] = _index
+# MOVE_DIRECTIONS is ordered so that i and (i + 2) % 4 are opposites
+_OPPOSITE = (np.arange(len(MOVE_DIRECTIONS)) + 2) % len(MOVE_DIRECTIONS)
+
+class TrajectoryRecorder:
+    def __init__(self, num_agents, grid_shape, window=1024, goal=None, spill_dir=None):
+        """Allocate ring buffers for num_agents agents on a grid of grid_shape.
+
+        goal is an (x, y) cell used to log arrival ticks. If spill_dir is
+        given, each window is saved there as an .npz before it wraps.
+        """
+        self.num_agents = num_agents
+        self.grid_shape = grid_shape
+        self.window = window
+        self.goal = goal
+        self.spill_dir = spill_dir
+
+        # int16 coordinates unless the grid is too big for them
+        coord_type = np.int16 if max(grid_shape) <= np.iinfo(np.int16).max else np.int32
+        self.xs = np.zeros((window, num_agents), dtype=coord_type)
+        self.ys = np.zeros((window, num_agents), dtype=coord_type)
+        self.directions = np.full((window, num_agents), -1, dtype=np.int8)
+        self.tick = 0  # ticks recorded so far
+        self.chunks_spilled = 0
+
+        # Whole-run statistics
+        self.visit_counts = np.zeros(grid_shape, dtype=np.int32)
+        self.moves = np.zeros(num_agents, dtype=np.int64)
+        self.backtracks = np.zeros(num_agents, dtype=np.int64)
+        self.arrival_ticks = np.full(num_agents, -1, dtype=np.int64)
+        # each agent's latest real move, to spot reversals across idle ticks
+        self.last_direction = np.full(num_agents, -1, dtype=np.int8)
+
+    def record_agents(self, agents):
+        """Record one tick from agent objects (positions and velocities)."""
+        xs = np.fromiter((agent.x for agent in agents), dtype=np.int64, count=self.num_agents)
+        ys = np.fromiter((agent.y for agent in agents), dtype=np.int64, count=self.num_agents)
+        vxs = np.fromiter((agent.vx for agent in agents), dtype=np.int64, count=self.num_agents)
+        vys = np.fromiter((agent.vy for agent in agents), dtype=np.int64, count=self.num_agents)
+        self.record(xs, ys, _VELOCITY_DIRECTION[(vxs + 1) * 3 + (vys + 1)])
+        # cells walked through on the way, with junction moves
+        passed = [cell for agent in agents for cell in getattr(agent, 'passed_cells', ())]
+        if passed:
+            passed_xs, passed_ys = zip(*passed)
+            np.add.at(self.visit_counts, (passed_ys, passed_xs), 1)
+
+    def record(self, xs, ys, directions):
+        """Record one tick of positions and direction indices (arrays)."""
+        slot = self.tick % self.window
+        if slot == 0 and self.tick > 0 and self.spill_dir is not None:
+            self._spill()
+        self.xs[slot] = xs
+        self.ys[slot] = ys
+        self.directions[slot] = directions
+
+        np.add.at(self.visit_counts, (ys, xs), 1)
+        moved = directions >= 0
+        self.moves += moved
+        reversed_move = moved & (self.last_direction >= 0) & \
+            (_OPPOSITE[np.maximum(self.last_direction, 0)] == directions)
+        self.backtracks += reversed_move
+        self.last_direction = np.where(moved, directions, self.last_direction).astype(np.int8)
+
+        if self.goal is not None:
+            arrived = (xs == self.goal[0]) & (ys == self.goal[1]) & (self.arrival_ticks < 0)
+            self.arrival_ticks[arrived] = self.tick
+        self.tick += 1
+
+    def recent(self):
+        """The buffered ticks in chronological order, as (xs, ys, directions)."""
+        if self.tick <= self.window:
+            return self.xs[:self.tick], self.ys[:self.tick], self.directions[:self.tick]
+        slot = self.tick % self.window
+        return tuple(np.concatenate((array[slot:], array[:slot]))
+                     for array in (self.xs, self.ys, self.directions))
+
+    def backtrack_frequency(self):
+        """Fraction of each agent's moves that reversed its previous move."""
+        return self.backtracks / np.maximum(self.moves, 1)
+
+    def loop_frequency(self):
+        """Fraction of each agent's moves in the window that came back to a
+        cell it had already been on in the window."""
+        xs, ys, directions = self.recent()
+        if not len(xs):
+            return np.zeros(self.num_agents)
+        # distinct cells per agent column, by sorting the encoded cells
+        cells = np.sort(ys.astype(np.int64) * self.grid_shape[1] + xs, axis=0)
+        distinct = 1 + np.count_nonzero(np.diff(cells, axis=0), axis=0)
+        moves = np.count_nonzero(directions[1:] >= 0, axis=0)
+        revisits = moves - (distinct - 1)
+        return revisits / np.maximum(moves, 1)
+
+    def time_to_goal(self):
+        """Arrival tick of every agent that has reached the goal."""
+        return self.arrival_ticks[self.arrival_ticks >= 0]
+
+    def _spill(self):
+        """Save the full window before it gets overwritten."""
+        os.makedirs(self.spill_dir, exist_ok=True)
+        path = os.path.join(self.spill_dir, f"trajectory_{self.chunks_spilled:06d}.npz")
+        np.savez(path, start_tick=self.tick - self.window,
+                 xs=self.xs, ys=self.ys, directions=self.directions)
+        self.chunks_spilled += 1
+
+    def spilled_chunks(self):
+        """Yield (start_tick, xs, ys, directions) for every spilled window."""
+        for index in range(self.chunks_spilled):
+            path = os.path.join(self.spill_dir, f"trajectory_{index:06d}.npz")
+            with np.load(path) as chunk:
+                yield int(chunk['start_tick']), chunk['xs'], chunk['ys'], chunk['directions']
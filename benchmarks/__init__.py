@@ -0,0 +1 @@
+# Leave empty - just marks directory as Python package 
\ No newline at end of file
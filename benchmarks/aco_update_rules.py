@@ -0,0 +1,92 @@
+import sys
+from collections import deque
+import numpy as np
+from maze.dynamic_maze import MASK_MOVES
+from visualization.simulation import Simulation
+
+"""
+Compare the default pheromone update with MAX-MIN Ant System.
+
+Each rule runs on the same seeded mazes (layout, colony, goal and
+wall-change schedule) until the best pheromone path has been stable for
+'convergence_ticks' ticks. For each maze size and number of agents the
+benchmark reports, averaged over seeds:
+- first: ticks until the first agent reached the goal
+- ticks: ticks until the trail converged, i.e. until a pheromone trail
+  links colony and goal and stays unchanged (runs that time out count
+  at the tick budget)
+- solved: fraction of runs that converged on a path to the goal
+- excess: converged path length over the shortest path length, for the
+  runs that converged (1.00 is optimal)
+
+Usage: python -m benchmarks.aco_update_rules [num_seeds]
+"""
+
+RULES = {
+    'default': {},
+    'mmas': {'update_rule': 'mmas'},
+}
+MAZE_SIZES = [(10, 10), (20, 20)]
+AGENT_COUNTS = [4, 8]
+MAX_TICKS = 3000
+
+def shortest_path_length(maze, start, goal):
+    """Steps on the shortest start-goal path of the maze as it is now."""
+    distances = {start: 0}
+    queue = deque([start])
+    while queue:
+        x, y = queue.popleft()
+        if (x, y) == goal:
+            return distances[(x, y)]
+        for dx, dy in MASK_MOVES[maze.move_mask[y, x]]:
+            if (x + dx, y + dy) not in distances:
+                distances[(x + dx, y + dy)] = distances[(x, y)] + 1
+                queue.append((x + dx, y + dy))
+    return None
+
+def run_once(rule, size, num_agents, seed):
+    """Run one headless simulation and return its measurements."""
+    config = {
+        'maze_size': size,
+        'num_agents': num_agents,
+        'wall_change_interval': 60,
+        'wall_change_probability': 0.01,
+        'fps': 15,
+        'simulation_time': MAX_TICKS / 15,
+        'headless': True,
+        'stop_on': 'converged',
+        'convergence_ticks': 100,
+        'max_ticks': MAX_TICKS,
+        'maze_seed': seed,
+        'aco': RULES[rule],
+    }
+    # maze layout, colony and goal come from the global random state
+    np.random.seed(seed)
+    sim = Simulation(config)
+    results = sim.run()
+    solved = results['stop_reason'] == 'converged'
+    shortest = shortest_path_length(sim.maze, sim.colony_pos, sim.goal_pos)
+    return {
+        'first': results['finish_tick'] if results['finish_tick'] is not None else results['ticks'],
+        'ticks': results['ticks'],
+        'solved': solved,
+        'excess': (results['best_path_length'] / shortest
+                   if solved and shortest else None),
+    }
+
+def main():
+    num_seeds = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"{'size':>8} {'agents':>7} {'rule':>12} {'first':>8} {'ticks':>8} {'solved':>7} {'excess':>7}")
+    for size in MAZE_SIZES:
+        for num_agents in AGENT_COUNTS:
+            for rule in RULES:
+                runs = [run_once(rule, size, num_agents, seed) for seed in range(num_seeds)]
+                excess = [r['excess'] for r in runs if r['excess'] is not None]
+                print(f"{size[0]}x{size[1]:<5} {num_agents:>7} {rule:>12} "
+                      f"{np.mean([r['first'] for r in runs]):>8.1f} "
+                      f"{np.mean([r['ticks'] for r in runs]):>8.1f} "
+                      f"{np.mean([r['solved'] for r in runs]):>7.2f} "
+                      f"{np.mean(excess) if excess else float('nan'):>7.2f}")
+
+if __name__ == "__main__":
+    main()
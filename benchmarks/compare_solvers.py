@@ -0,0 +1,75 @@
+import sys
+import time
+import numpy as np
+from visualization.simulation import Simulation
+
+"""
+Compare the ACO swarm with the baseline solvers on identical dynamic mazes.
+
+Every solver runs on the same seeded mazes (layout, colony and goal) and
+the same seeded wall-change schedule. For each maze size and wall change
+probability the benchmark reports, averaged over seeds:
+- steps: ticks until the first agent reaches the goal (runs that time out
+  count at the tick budget)
+- solved: fraction of runs where some agent reached the goal
+- cpu/step: CPU time per agent step
+- replans/change: replans per agent per wall change event, i.e. how
+  often a change opened a wall or closed one on an agent's path
+  (planning solvers only)
+
+Usage: python -m benchmarks.compare_solvers [num_seeds]
+"""
+
+SOLVERS = ['aco', 'bfs', 'astar', 'wall_follower']
+MAZE_SIZES = [(10, 10), (20, 20), (40, 40)]
+WALL_CHANGE_PROBABILITIES = [0.0, 0.01, 0.05]
+NUM_AGENTS = 6
+MAX_TICKS = 4000
+
+def run_once(solver, size, probability, seed):
+    """Run one headless simulation and return its measurements."""
+    config = {
+        'maze_size': size,
+        'num_agents': NUM_AGENTS,
+        'wall_change_interval': 60,
+        'wall_change_probability': probability,
+        'fps': 15,
+        'simulation_time': MAX_TICKS / 15,
+        'headless': True,
+        'agent_type': solver,
+        'stop_on': 'first_arrival',
+        'max_ticks': MAX_TICKS,
+        'maze_seed': seed,
+    }
+    # maze layout, colony and goal come from the global random state
+    np.random.seed(seed)
+    sim = Simulation(config)
+    start = time.process_time()
+    results = sim.run()
+    cpu = time.process_time() - start
+    replans = sum(agent.replans for agent in sim.agents) if solver != 'aco' else None
+    return {
+        'steps': results['finish_tick'] if results['finish_tick'] is not None else results['ticks'],
+        'solved': results['finish_tick'] is not None,
+        'cpu_per_step': cpu / (results['ticks'] * NUM_AGENTS),
+        'replans_per_change': (replans / NUM_AGENTS / sim.maze.version
+                               if replans is not None and sim.maze.version else None),
+    }
+
+def main():
+    num_seeds = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"{'size':>8} {'p':>5} {'solver':>14} {'steps':>8} {'solved':>7} "
+          f"{'cpu/step (us)':>14} {'replans/change':>15}")
+    for size in MAZE_SIZES:
+        for probability in WALL_CHANGE_PROBABILITIES:
+            for solver in SOLVERS:
+                runs = [run_once(solver, size, probability, seed) for seed in range(num_seeds)]
+                replans = [r['replans_per_change'] for r in runs if r['replans_per_change'] is not None]
+                print(f"{size[0]}x{size[1]:<5} {probability:>5} {solver:>14} "
+                      f"{np.mean([r['steps'] for r in runs]):>8.1f} "
+                      f"{np.mean([r['solved'] for r in runs]):>7.2f} "
+                      f"{np.mean([r['cpu_per_step'] for r in runs]) * 1e6:>14.1f} "
+                      f"{np.mean(replans) if replans else float('nan'):>15.2f}")
+
+if __name__ == "__main__":
+    main()
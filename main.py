@@ -9,11 +9,12 @@ def main():
     NUM_AGENTS = 6       # Number of agents searching for goal
     
     # Dynamic maze settings
-    WALL_CHANGE_INTERVAL = 60   # How often walls can change (frames between changes)
+    WALL_CHANGE_INTERVAL = 60   # How often walls can change (simulation ticks between changes)
     WALL_CHANGE_PROBABILITY = 0.03  # Chance of each wall changing when update occurs
     
     # Simulation settings
-    FPS = 15            # Frames per second (lower = slower simulation)
+    FPS = 15            # Frames drawn per second
+    SIM_RATE = 15       # Simulation ticks per second (raise to fast-forward, independent of FPS)
     SIMULATION_TIME = 30  # Maximum time in seconds before simulation ends
     
     # ACO (Ant Colony Optimization) parameters
@@ -29,6 +30,7 @@ def main():
         'wall_change_interval': WALL_CHANGE_INTERVAL,
         'wall_change_probability': WALL_CHANGE_PROBABILITY,
         'fps': FPS,
+        'sim_rate': SIM_RATE,
         'simulation_time': SIMULATION_TIME,
         
         # ACO behavior settings
@@ -0,0 +1,115 @@
+import numpy as np
+from maze.dynamic_maze import MASK_MOVES, MOVE_DIRECTIONS
+
+"""
+Dead-end filling index for a dynamic maze.
+
+Dead-end filling repeatedly marks open cells with at most one open, unmarked
+neighbor until nothing changes. What remains unmarked are the cells that can
+lie on a path between protected cells (the colony and the goal) or on a loop;
+every marked cell is provably useless for reaching the goal.
+
+Cells are numbered in the order they get marked. Within a dead branch every
+cell is marked after the cells behind it, so the neighbor with the higher
+number (or an unmarked one) is always the way back out.
+
+The first fill runs vectorized passes over the whole grid while they still
+mark many cells, then finishes the long corridors with a worklist. Wall
+changes only refill around the toggled cells.
+"""
+
+class DeadEndIndex:
+    def __init__(self, maze, protected=()):
+        """Index maze, never marking the (x, y) cells in protected."""
+        self.maze = maze
+        self.protected = set(protected)
+        # mark order per cell; 0 means not marked (open and useful, or wall)
+        self.order = np.zeros(maze.grid.shape, dtype=np.int64)
+        self.counter = 0
+        self.rebuild()
+
+    @property
+    def dead(self):
+        """Boolean grid of marked cells."""
+        return self.order > 0
+
+    def rebuild(self):
+        """Fill the whole grid from scratch."""
+        grid = self.maze.grid
+        rows, cols = grid.shape
+        self.order[:] = 0
+        self.counter = 0
+        live = grid == 0
+        can_mark = live.copy()
+        for x, y in self.protected:
+            can_mark[y, x] = False
+
+        # Vectorized passes while they pay for themselves
+        while True:
+            padded = np.pad(live, 1, constant_values=False)
+            live_neighbors = sum(padded[1 + dy:1 + dy + rows, 1 + dx:1 + dx + cols].astype(np.int8)
+                                 for dx, dy in MOVE_DIRECTIONS)
+            newly_dead = live & can_mark & (live_neighbors <= 1)
+            count = np.count_nonzero(newly_dead)
+            if not count:
+                return
+            self.counter += 1
+            self.order[newly_dead] = self.counter
+            live &= ~newly_dead
+            if count < live.size // 100:
+                break
+
+        # Finish with a worklist from the cells next to the last pass
+        ys, xs = np.nonzero(newly_dead)
+        seeds = [(x + dx, y + dy) for x, y in zip(xs.tolist(), ys.tolist())
+                 for dx, dy in MASK_MOVES[self.maze.move_mask[y, x]]]
+        self._fill_from(seeds)
+
+    def _fill_from(self, seeds):
+        """Mark cells reachable from seeds that are left with one way out."""
+        grid = self.maze.grid
+        move_mask = self.maze.move_mask
+        order = self.order
+        stack = list(seeds)
+        while stack:
+            x, y = stack.pop()
+            if grid[y, x] != 0 or order[y, x] or (x, y) in self.protected:
+                continue
+            exits = [(x + dx, y + dy) for dx, dy in MASK_MOVES[move_mask[y, x]]
+                     if not order[y + dy, x + dx]]
+            if len(exits) <= 1:
+                self.counter += 1
+                order[y, x] = self.counter
+                stack.extend(exits)
+
+    def update(self, changed_cells):
+        """Refill around cells toggled by a maze update."""
+        grid = self.maze.grid
+        move_mask = self.maze.move_mask
+        seeds = []
+        for x, y in changed_cells:
+            if grid[y, x] == 0:
+                # An opening can revive the dead cells connected to it
+                self.order[y, x] = 0
+                stack = [(x, y)]
+                while stack:
+                    cx, cy = stack.pop()
+                    seeds.append((cx, cy))
+                    for dx, dy in MASK_MOVES[move_mask[cy, cx]]:
+                        if self.order[cy + dy, cx + dx]:
+                            self.order[cy + dy, cx + dx] = 0
+                            stack.append((cx + dx, cy + dy))
+            else:
+                # A closing can strand the cells around it
+                self.order[y, x] = 0
+                seeds.extend((x + dx, y + dy) for dx, dy in MASK_MOVES[move_mask[y, x]])
+        self._fill_from(seeds)
+
+    def is_useless_move(self, x, y, new_x, new_y):
+        """Whether stepping from (x, y) to (new_x, new_y) leads deeper into
+        a dead end (rather than out of one)."""
+        target = self.order[new_y, new_x]
+        if not target:
+            return False
+        current = self.order[y, x]
+        return not current or target < current
@@ -1,51 +1,221 @@
 import numpy as np
 from maze.perfect_maze import PerfectMaze
 
+# Cardinal moves in the order agents consider them. Bit i of a cell's move
+# mask is set when MOVE_DIRECTIONS[i] leads to an open cell.
+MOVE_DIRECTIONS = [(0,1), (1,0), (0,-1), (-1,0)]
+# Legal (dx, dy) moves for every possible 4-bit mask
+MASK_MOVES = [
+    tuple(move for bit, move in enumerate(MOVE_DIRECTIONS) if mask & (1 << bit))
+    for mask in range(1 << len(MOVE_DIRECTIONS))
+]
+
 class DynamicMaze(PerfectMaze):
-    def __init__(self, width, height, change_probability=0.01):
-        """Initialize a dynamic maze."""
-        super().__init__(width, height)
+    def __init__(self, width, height, change_probability=0.01, seed=None):
+        """Initialize a dynamic maze.
+        
+        Generation and wall changes draw from the shared numpy random state
+        unless a seed is given. They use separate streams, so the wall
+        changes are the same whether the grid is generated or loaded.
+        """
+        super().__init__(width, height, seed)
         self.change_probability = change_probability
+        self.wall_rng = np.random if seed is None else np.random.RandomState([seed, 1])
         # keep track of walls that can change (not outer walls)
         self.changeable_walls = []
+        # cells toggled by the last update(), as (x, y)
+        self.changed_cells = []
+        # bumped by every update() that changes at least one wall
+        self.version = 0
+        # optional ClusterHierarchy, kept in step with wall changes
+        self.hierarchy = None
+        # optional DeadEndIndex, kept in step with wall changes
+        self.dead_ends = None
+        # optional JunctionGraph, kept in step with wall changes
+        self.junctions = None
+        # open-direction bitmask per cell, see MOVE_DIRECTIONS
+        self.move_mask = np.zeros((height * 2 + 1, width * 2 + 1), dtype=np.uint8)
         
         # Add pheromone grid
         self.pheromone_grid = np.zeros((height * 2 + 1, width * 2 + 1))
         self.evaporation_rate = 0.85  # Increased evaporation from 0.90
+        # optional (min, max) the trail is clipped to, as in MAX-MIN Ant System
+        self.pheromone_bounds = None
+        # fraction of the largest departure from the background pheromone
+        # a cell needs to count as trail in extract_best_path()
+        self.trail_threshold = 0.05
+        
+    @classmethod
+    def from_arrays(cls, grid, pheromone_grid, move_mask, change_probability=0.01, seed=None):
+        """Wrap existing arrays (e.g. in shared memory) without copying them."""
+        maze = cls(0, 0, change_probability, seed)
+        maze.height = (grid.shape[0] - 1) // 2
+        maze.width = (grid.shape[1] - 1) // 2
+        maze.grid = grid
+        maze.pheromone_grid = pheromone_grid
+        maze.move_mask = move_mask
+        return maze
         
     def generate(self):
         """Generate initial maze and identify changeable walls."""
         maze = super().generate()
-        self._identify_changeable_walls()
+        self._index_grid()
         return maze
         
+    def load_grid(self, grid):
+        """Use a previously generated grid (e.g. from a MazeCache) instead
+        of generating one."""
+        self.grid[:] = grid
+        self._index_grid()
+        return self.grid
+        
+    def _index_grid(self):
+        """Build everything derived from a freshly generated grid."""
+        self._identify_changeable_walls()
+        self.rebuild_move_mask()
+        
+    def rebuild_move_mask(self):
+        """Recompute the open-direction bitmask of every cell from the grid."""
+        open_cells = np.pad(self.grid == 0, 1, constant_values=False)
+        rows, cols = self.grid.shape
+        self.move_mask = np.zeros(self.grid.shape, dtype=np.uint8)
+        for bit, (dx, dy) in enumerate(MOVE_DIRECTIONS):
+            # neighbor_open[y, x] is open_cells[y + dy, x + dx] without padding
+            neighbor_open = open_cells[1 + dy:1 + dy + rows, 1 + dx:1 + dx + cols]
+            self.move_mask |= neighbor_open.astype(np.uint8) << bit
+            
+    def open_moves(self, xs, ys):
+        """Gather the move masks of many cells at once (e.g. all agents)."""
+        return self.move_mask[ys, xs]
+        
+    def _patch_move_mask(self, x, y):
+        """Fix the masks of the four cells next to a toggled cell."""
+        is_open = self.grid[y, x] == 0
+        for bit, (dx, dy) in enumerate(MOVE_DIRECTIONS):
+            # the neighbor that reaches (x, y) by moving (dx, dy)
+            nx, ny = x - dx, y - dy
+            if 0 <= ny < self.grid.shape[0] and 0 <= nx < self.grid.shape[1]:
+                if is_open:
+                    self.move_mask[ny, nx] |= 1 << bit
+                else:
+                    self.move_mask[ny, nx] &= ~np.uint8(1 << bit)
+        
     def _identify_changeable_walls(self):
         """Find all walls that could potentially change."""
-        self.changeable_walls = []
         # skip outer walls by checking inner grid points
-        for y in range(1, self.height * 2):
-            for x in range(1, self.width * 2):
-                if self.grid[y, x] == 1:  # if it's a wall
-                    self.changeable_walls.append((x, y))
+        ys, xs = np.nonzero(self.grid[1:-1, 1:-1] == 1)
+        self.changeable_walls = list(zip((xs + 1).tolist(), (ys + 1).tolist()))
     
     def update(self):
         """Update maze and decay pheromones."""
         # Update walls
-        for y in range(1, self.grid.shape[0] - 1):
-            for x in range(1, self.grid.shape[1] - 1):
-                if np.random.random() < self.change_probability:
-                    # Only change walls, not paths
-                    if self.grid[y, x] == 1:
-                        self.grid[y, x] = 0
-                    elif all(self.grid[ny, nx] == 0 for ny, nx in self._get_neighbors(y, x)):
-                        self.grid[y, x] = 1
+        self.changed_cells = self.mutate_walls(1, self.grid.shape[0] - 1)
+        if self.changed_cells:
+            self.version += 1
+        if self.hierarchy is not None:
+            self.hierarchy.update(self.changed_cells)
+            self.hierarchy.evaporate(self.evaporation_rate)
+        if self.dead_ends is not None and self.changed_cells:
+            self.dead_ends.update(self.changed_cells)
+        if self.junctions is not None:
+            self.junctions.update(self.changed_cells)
                         
         # Decay pheromones
         # print("\nDecaying pheromones")
         # print(f"Before decay - Max: {np.max(self.pheromone_grid)}, Mean: {np.mean(self.pheromone_grid)}")
         self.pheromone_grid *= self.evaporation_rate
+        if self.pheromone_bounds is not None:
+            np.clip(self.pheromone_grid, *self.pheromone_bounds, out=self.pheromone_grid)
         # print(f"After decay - Max: {np.max(self.pheromone_grid)}, Mean: {np.mean(self.pheromone_grid)}")
 
+    def mutate_walls(self, y_start, y_stop):
+        """Randomly toggle walls in rows y_start..y_stop-1 (never the outer walls).
+        
+        Returns the toggled cells as (x, y). Move masks of neighboring
+        cells are patched, which may touch the rows just outside the range.
+        """
+        changed = []
+        for y in range(max(1, y_start), min(y_stop, self.grid.shape[0] - 1)):
+            for x in range(1, self.grid.shape[1] - 1):
+                if self.wall_rng.random() < self.change_probability:
+                    # Only change walls, not paths
+                    if self.grid[y, x] == 1:
+                        self.grid[y, x] = 0
+                    elif all(self.grid[ny, nx] == 0 for ny, nx in self._get_neighbors(y, x)):
+                        self.grid[y, x] = 1
+                    else:
+                        continue
+                    changed.append((x, y))
+                    self._patch_move_mask(x, y)
+        return changed
+
+    def extract_best_path(self, start, goal):
+        """Greedily follow the strongest pheromone trail from start to goal.
+        
+        Only trail cells are stepped onto: open cells whose pheromone is
+        off the background (the weakest open cell, or 0) by at least
+        trail_threshold of the largest such difference. Steps away from
+        the goal leave negative pheromone, and count as trail too. At each
+        cell the unvisited trail neighbor with the most pheromone is taken,
+        backing up out of branches that dead-end. Returns the list of
+        (x, y) cells from start to goal, or an empty list if the trail
+        doesn't get there.
+        """
+        open_pheromone = self.pheromone_grid[self.grid == 0]
+        if not open_pheromone.size:
+            return []
+        background = max(open_pheromone.min(), 0.0)
+        strongest = np.abs(open_pheromone - background).max()
+        if strongest == 0:
+            return []  # no trail at all
+        threshold = self.trail_threshold * strongest
+        
+        path = [start]
+        visited = {start}
+        # untried trail cells around each cell on the path
+        candidates = [self._trail_neighbors(start, goal, visited, background, threshold)]
+        while candidates:
+            if path[-1] == goal:
+                return path
+            if not candidates[-1]:
+                # trail dead-ends here, back up
+                path.pop()
+                candidates.pop()
+                continue
+            cell = candidates[-1].pop()
+            if cell in visited:
+                continue
+            visited.add(cell)
+            path.append(cell)
+            candidates.append(self._trail_neighbors(cell, goal, visited, background, threshold))
+        return []
+        
+    def _trail_neighbors(self, cell, goal, visited, background, threshold):
+        """Unvisited neighbors on the trail, weakest pheromone first.
+        
+        A neighbor below the threshold still counts if it leads on to a
+        trail cell: agents leave no pheromone on cells they enter from as
+        far off the goal as they started, so a real route has such gaps.
+        """
+        x, y = cell
+        neighbors = []
+        for dx, dy in MASK_MOVES[self.move_mask[y, x]]:
+            nx, ny = x + dx, y + dy
+            if (nx, ny) in visited:
+                continue
+            # Always step onto the goal when it's adjacent
+            if (nx, ny) == goal:
+                return [goal]
+            if abs(self.pheromone_grid[ny, nx] - background) < threshold and not any(
+                    (nx + ex, ny + ey) == goal or
+                    abs(self.pheromone_grid[ny + ey, nx + ex] - background) >= threshold
+                    for ex, ey in MASK_MOVES[self.move_mask[ny, nx]]
+                    if (nx + ex, ny + ey) != cell):
+                continue
+            neighbors.append((nx, ny))
+        neighbors.sort(key=lambda c: self.pheromone_grid[c[1], c[0]])
+        return neighbors
+
     def _get_neighbors(self, y, x):
         """Get valid neighboring cells."""
         neighbors = []
@@ -0,0 +1,242 @@
+import heapq
+from collections import deque
+import numpy as np
+from maze.dynamic_maze import MASK_MOVES
+
+"""
+Hierarchical (HPA*-style) cluster abstraction of a dynamic maze.
+
+The grid is partitioned into square clusters. Wherever two neighboring
+clusters are connected across their shared border, each run of open
+crossings gets one entrance: a pair of cells, one on each side. The
+abstract graph links entrances across borders (cost 1) and, inside each
+cluster, links every pair of entrances by their shortest in-cluster path.
+One Dijkstra pass from the goal over this small graph then gives every
+entrance its distance to the goal, and a cell's distance estimate is the
+best entrance of its cluster plus the in-cluster distance to it.
+
+The hierarchy also keeps a pheromone level per cluster, which builds up
+and evaporates at cluster granularity, so long trails show up much
+sooner than they do cell by cell.
+
+Wall changes only rebuild the borders and clusters they touch.
+"""
+
+class ClusterHierarchy:
+    def __init__(self, maze, goal, cluster_size=16):
+        """Build the abstraction of maze for reaching goal, an (x, y) cell."""
+        self.maze = maze
+        self.goal = goal
+        self.cluster_size = cluster_size
+        rows, cols = maze.grid.shape
+        self.num_clusters = (-(-rows // cluster_size), -(-cols // cluster_size))
+        self.cluster_pheromone = np.zeros(self.num_clusters)
+
+        self.entrances = {}      # border key -> [(cell, cell across the border)]
+        self.cluster_nodes = {}  # (cy, cx) -> set of entrance cells (and the goal)
+        self.intra = {}          # (cy, cx) -> {node: [(other node, cost)]}
+        self.node_distance = {}  # node -> distance to the goal
+        self._fields = {}        # (cy, cx) -> (version, node distances used, distance field)
+        self._distance_version = 0  # bumped by every _compute_distances()
+
+        for cy in range(self.num_clusters[0]):
+            for cx in range(self.num_clusters[1]):
+                for border in self._borders_of_cluster(cy, cx):
+                    if border not in self.entrances:
+                        self.entrances[border] = self._scan_border(border)
+        for cy in range(self.num_clusters[0]):
+            for cx in range(self.num_clusters[1]):
+                self._rebuild_cluster((cy, cx))
+        self._compute_distances()
+
+    def cluster_of(self, x, y):
+        return (y // self.cluster_size, x // self.cluster_size)
+
+    def _cluster_bounds(self, cluster):
+        """(y_start, y_stop, x_start, x_stop) of a cluster."""
+        rows, cols = self.maze.grid.shape
+        cy, cx = cluster
+        size = self.cluster_size
+        return (cy * size, min((cy + 1) * size, rows), cx * size, min((cx + 1) * size, cols))
+
+    def _borders_of_cluster(self, cy, cx):
+        """Keys of the borders around a cluster.
+
+        ('h', cy, cx) is the border between (cy, cx) and (cy, cx + 1),
+        ('v', cy, cx) the one between (cy, cx) and (cy + 1, cx).
+        """
+        borders = []
+        if cx + 1 < self.num_clusters[1]:
+            borders.append(('h', cy, cx))
+        if cx > 0:
+            borders.append(('h', cy, cx - 1))
+        if cy + 1 < self.num_clusters[0]:
+            borders.append(('v', cy, cx))
+        if cy > 0:
+            borders.append(('v', cy - 1, cx))
+        return borders
+
+    def _borders_of_cell(self, x, y):
+        """Keys of the borders a cell lies on."""
+        cy, cx = self.cluster_of(x, y)
+        size = self.cluster_size
+        borders = []
+        if x % size == size - 1 and cx + 1 < self.num_clusters[1]:
+            borders.append(('h', cy, cx))
+        if x % size == 0 and cx > 0:
+            borders.append(('h', cy, cx - 1))
+        if y % size == size - 1 and cy + 1 < self.num_clusters[0]:
+            borders.append(('v', cy, cx))
+        if y % size == 0 and cy > 0:
+            borders.append(('v', cy - 1, cx))
+        return borders
+
+    def _border_clusters(self, border):
+        kind, cy, cx = border
+        return [(cy, cx), (cy, cx + 1) if kind == 'h' else (cy + 1, cx)]
+
+    def _scan_border(self, border):
+        """One entrance per run of open crossings along a border."""
+        kind, cy, cx = border
+        grid = self.maze.grid
+        y_start, y_stop, x_start, x_stop = self._cluster_bounds((cy, cx))
+        if kind == 'h':
+            x = x_stop - 1
+            crossings = [((x, y), (x + 1, y)) for y in range(y_start, y_stop)]
+        else:
+            y = y_stop - 1
+            crossings = [((x, y), (x, y + 1)) for x in range(x_start, x_stop)]
+
+        entrances = []
+        run = []
+        for near, far in crossings:
+            if grid[near[1], near[0]] == 0 and grid[far[1], far[0]] == 0:
+                run.append((near, far))
+            elif run:
+                entrances.append(run[len(run) // 2])
+                run = []
+        if run:
+            entrances.append(run[len(run) // 2])
+        return entrances
+
+    def _rebuild_cluster(self, cluster):
+        """Recollect a cluster's nodes and the shortest paths between them."""
+        nodes = set()
+        for border in self._borders_of_cluster(*cluster):
+            for near, far in self.entrances[border]:
+                nodes.add(near if self.cluster_of(*near) == cluster else far)
+        if self.cluster_of(*self.goal) == cluster:
+            nodes.add(self.goal)
+        self.cluster_nodes[cluster] = nodes
+        self.intra[cluster] = {}
+        for node in nodes:
+            distances = self._bfs_in_cluster(cluster, node)
+            self.intra[cluster][node] = [(other, distances[other]) for other in nodes
+                                         if other != node and other in distances]
+        self._fields.pop(cluster, None)
+
+    def _bfs_in_cluster(self, cluster, start):
+        """Step counts from start to every cell reachable inside the cluster."""
+        y_start, y_stop, x_start, x_stop = self._cluster_bounds(cluster)
+        move_mask = self.maze.move_mask
+        distances = {start: 0}
+        queue = deque([start])
+        while queue:
+            x, y = queue.popleft()
+            for dx, dy in MASK_MOVES[move_mask[y, x]]:
+                nx, ny = x + dx, y + dy
+                if (nx, ny) not in distances and x_start <= nx < x_stop and y_start <= ny < y_stop:
+                    distances[(nx, ny)] = distances[(x, y)] + 1
+                    queue.append((nx, ny))
+        return distances
+
+    def _compute_distances(self):
+        """Dijkstra from the goal over the abstract graph."""
+        neighbors = {}
+        for cluster_edges in self.intra.values():
+            for node, edges in cluster_edges.items():
+                neighbors.setdefault(node, []).extend(edges)
+        for border_entrances in self.entrances.values():
+            for near, far in border_entrances:
+                neighbors.setdefault(near, []).append((far, 1))
+                neighbors.setdefault(far, []).append((near, 1))
+
+        self._distance_version += 1
+        self.node_distance = {self.goal: 0}
+        frontier = [(0, self.goal)]
+        while frontier:
+            distance, node = heapq.heappop(frontier)
+            if distance > self.node_distance[node]:
+                continue  # stale entry
+            for other, cost in neighbors.get(node, []):
+                if distance + cost < self.node_distance.get(other, np.inf):
+                    self.node_distance[other] = distance + cost
+                    heapq.heappush(frontier, (distance + cost, other))
+
+    def update(self, changed_cells):
+        """Rebuild only what the toggled (x, y) cells can have affected."""
+        if not changed_cells:
+            return
+        dirty_clusters = set()
+        for x, y in changed_cells:
+            dirty_clusters.add(self.cluster_of(x, y))
+            for border in self._borders_of_cell(x, y):
+                self.entrances[border] = self._scan_border(border)
+                dirty_clusters.update(self._border_clusters(border))
+        for cluster in dirty_clusters:
+            self._rebuild_cluster(cluster)
+        self._compute_distances()
+
+    def goal_distance(self, x, y):
+        """Estimated steps from a cell to the goal (inf if cut off)."""
+        cluster = self.cluster_of(x, y)
+        y_start, _, x_start, _ = self._cluster_bounds(cluster)
+        return self._field(cluster)[y - y_start, x - x_start]
+
+    def _field(self, cluster):
+        """Distance-to-goal of every cell in a cluster, computed lazily and
+        kept until the cluster or its entrances' distances change."""
+        cached = self._fields.get(cluster)
+        if cached is not None and cached[0] == self._distance_version:
+            return cached[2]
+        sources = tuple(sorted((node, self.node_distance[node])
+                               for node in self.cluster_nodes[cluster]
+                               if node in self.node_distance))
+        if cached is not None and cached[1] == sources:
+            # distances changed elsewhere only
+            self._fields[cluster] = (self._distance_version, sources, cached[2])
+            return cached[2]
+
+        # Dijkstra inside the cluster, seeded with every node's distance
+        y_start, y_stop, x_start, x_stop = self._cluster_bounds(cluster)
+        field = np.full((y_stop - y_start, x_stop - x_start), np.inf)
+        move_mask = self.maze.move_mask
+        frontier = [(distance, node) for node, distance in sources]
+        for distance, (x, y) in frontier:
+            field[y - y_start, x - x_start] = min(field[y - y_start, x - x_start], distance)
+        heapq.heapify(frontier)
+        while frontier:
+            distance, (x, y) = heapq.heappop(frontier)
+            if distance > field[y - y_start, x - x_start]:
+                continue
+            for dx, dy in MASK_MOVES[move_mask[y, x]]:
+                nx, ny = x + dx, y + dy
+                if (x_start <= nx < x_stop and y_start <= ny < y_stop and
+                        distance + 1 < field[ny - y_start, nx - x_start]):
+                    field[ny - y_start, nx - x_start] = distance + 1
+                    heapq.heappush(frontier, (distance + 1, (nx, ny)))
+        self._fields[cluster] = (self._distance_version, sources, field)
+        return field
+
+    def pheromone_at(self, x, y):
+        """Cluster-level pheromone around a cell."""
+        return self.cluster_pheromone[y // self.cluster_size, x // self.cluster_size]
+
+    def deposit(self, ys, xs, strengths):
+        """Add deposits (scalars or arrays) to the clusters they fall in."""
+        np.add.at(self.cluster_pheromone,
+                  (np.asarray(ys) // self.cluster_size, np.asarray(xs) // self.cluster_size),
+                  strengths)
+
+    def evaporate(self, rate):
+        self.cluster_pheromone *= rate
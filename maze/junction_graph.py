@@ -0,0 +1,123 @@
+import numpy as np
+from maze.dynamic_maze import MASK_MOVES, MOVE_DIRECTIONS
+
+"""
+Corridor-contracted graph of a dynamic maze.
+
+Nodes are the open cells where a walker has a choice or has to turn back:
+junctions (three or more open neighbors) and dead ends (at most one), plus
+any protected cells such as the colony and the goal. Every other open cell
+has exactly two open neighbors, so it lies on a corridor between two nodes,
+and each corridor becomes one edge. An edge is stored from both ends as
+
+    edges[node][direction] = (end node, cells, (ys, xs))
+
+where direction indexes MOVE_DIRECTIONS, cells are the cells stepped onto
+in order (ending with the end node) and (ys, xs) index them in the grid.
+
+Wall changes only drop and re-trace the edges around the toggled cells.
+"""
+
+# number of open neighbors for each move mask
+_DEGREE = np.array([len(moves) for moves in MASK_MOVES], dtype=np.int8)
+
+class JunctionGraph:
+    def __init__(self, maze, protected=()):
+        """Contract maze, keeping the (x, y) cells in protected as nodes."""
+        self.maze = maze
+        self.protected = set(protected)
+        self.edges = {}     # node -> {direction: (end, cells, (ys, xs))}
+        self.corridor = {}  # corridor cell -> (node, direction) of an edge through it
+        self.rebuild()
+
+    def rebuild(self):
+        """Contract the whole grid from scratch."""
+        grid = self.maze.grid
+        nodes = (grid == 0) & (_DEGREE[self.maze.move_mask] != 2)
+        for x, y in self.protected:
+            nodes[y, x] = True
+        ys, xs = np.nonzero(nodes)
+        self.edges = {node: {} for node in zip(xs.tolist(), ys.tolist())}
+        self.corridor = {}
+        for node in list(self.edges):
+            self._trace_node(node)
+
+    def _is_node(self, x, y):
+        return self.maze.grid[y, x] == 0 and (
+            _DEGREE[self.maze.move_mask[y, x]] != 2 or (x, y) in self.protected)
+
+    def _trace_node(self, node):
+        """Trace every open direction of a node that has no edge yet."""
+        move_mask = self.maze.move_mask
+        for dx, dy in MASK_MOVES[move_mask[node[1], node[0]]]:
+            direction = MOVE_DIRECTIONS.index((dx, dy))
+            if direction not in self.edges[node]:
+                self._trace(node, direction)
+
+    def _trace(self, node, direction):
+        """Follow a corridor out of node and store it from both ends."""
+        move_mask = self.maze.move_mask
+        x, y = node
+        dx, dy = MOVE_DIRECTIONS[direction]
+        cells = []
+        while True:
+            x, y = x + dx, y + dy
+            cells.append((x, y))
+            if (x, y) in self.edges:
+                break
+            # corridor cell: carry on through the exit we didn't come in by
+            dx, dy = next(move for move in MASK_MOVES[move_mask[y, x]] if move != (-dx, -dy))
+        end = (x, y)
+        back = MOVE_DIRECTIONS.index((-dx, -dy))
+        xs, ys = zip(*cells)
+        self.edges[node][direction] = (end, cells, (np.array(ys), np.array(xs)))
+        reverse = cells[-2::-1] + [node]
+        xs, ys = zip(*reverse)
+        self.edges[end][back] = (node, reverse, (np.array(ys), np.array(xs)))
+        for cell in cells[:-1]:
+            self.corridor[cell] = (node, direction)
+
+    def _remove_edge(self, node, direction, retrace):
+        """Drop an edge from both ends, noting its ends for re-tracing."""
+        end, cells, _ = self.edges[node].pop(direction)
+        for cell in cells[:-1]:
+            del self.corridor[cell]
+        # the last step into end came from the cell before it (or node)
+        previous = cells[-2] if len(cells) > 1 else node
+        back = MOVE_DIRECTIONS.index((previous[0] - end[0], previous[1] - end[1]))
+        self.edges[end].pop(back, None)
+        retrace.update((node, end))
+
+    def update(self, changed_cells):
+        """Re-trace only the corridors the toggled (x, y) cells can have changed."""
+        if not changed_cells:
+            return
+        rows, cols = self.maze.grid.shape
+        affected = set()
+        for x, y in changed_cells:
+            affected.add((x, y))
+            affected.update((x + dx, y + dy) for dx, dy in MOVE_DIRECTIONS
+                            if 0 <= x + dx < cols and 0 <= y + dy < rows)
+
+        # Drop every edge that ends at or runs through an affected cell
+        retrace = set()
+        for cell in affected:
+            if cell in self.edges:
+                for direction in list(self.edges[cell]):
+                    # a loop back to the same node goes with its other end
+                    if direction in self.edges[cell]:
+                        self._remove_edge(cell, direction, retrace)
+            elif cell in self.corridor:
+                self._remove_edge(*self.corridor[cell], retrace)
+
+        # Affected cells may have become nodes or stopped being ones
+        for cell in affected:
+            if self._is_node(*cell):
+                self.edges.setdefault(cell, {})
+                retrace.add(cell)
+            else:
+                self.edges.pop(cell, None)
+
+        for node in retrace:
+            if node in self.edges:
+                self._trace_node(node)
@@ -0,0 +1,125 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from maze.perfect_maze import PerfectMaze
+
+"""
+On-disk pool of pre-generated maze grids.
+
+Grids are keyed by (width, height, algorithm, seed) and stored bit-packed
+(one bit per cell) as .npy files, which hits memory-map and unpack. The
+pool is kept under a byte budget by evicting the least recently used
+entries; every hit refreshes an entry's modification time, which is what
+the eviction order goes by.
+
+Pre-fill a pool before a batch run with, e.g.:
+
+    python -m maze.maze_cache .maze_cache --sizes 100x100 500x500 --seeds 0-31
+"""
+
+# Generators a cached grid can come from
+ALGORITHMS = {
+    'recursive_backtracking': PerfectMaze,
+}
+
+def generate_grid(width, height, algorithm='recursive_backtracking', seed=0):
+    """Generate the grid a cache entry holds."""
+    return ALGORITHMS[algorithm](width, height, seed).generate()
+
+class MazeCache:
+    def __init__(self, directory, max_bytes=256 * 2**20):
+        """Use (and create if needed) a pool directory capped at max_bytes."""
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, width, height, algorithm, seed):
+        """File holding the entry for a key."""
+        return os.path.join(self.directory, f"{algorithm}_{width}x{height}_{seed}.npy")
+
+    def get(self, width, height, algorithm='recursive_backtracking', seed=0):
+        """Return the cached grid for a key, or None on a miss."""
+        path = self.path(width, height, algorithm, seed)
+        try:
+            packed = np.load(path, mmap_mode='r')
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:
+            pass  # another process evicted it, but we already have the data
+        rows, cols = height * 2 + 1, width * 2 + 1
+        return np.unpackbits(packed, count=rows * cols).reshape(rows, cols).view(np.int8)
+
+    def put(self, width, height, algorithm, seed, grid):
+        """Store a grid under a key, then evict down to the byte budget."""
+        path = self.path(width, height, algorithm, seed)
+        # write then rename, so readers never see a partial file
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as file:
+            np.save(file, np.packbits(grid.astype(bool), axis=None))
+        os.replace(temp_path, path)
+        self.evict()
+
+    def load(self, width, height, algorithm='recursive_backtracking', seed=0):
+        """Return the grid for a key, generating and storing it on a miss."""
+        grid = self.get(width, height, algorithm, seed)
+        if grid is None:
+            grid = generate_grid(width, height, algorithm, seed)
+            self.put(width, height, algorithm, seed, grid)
+        return grid
+
+    def evict(self):
+        """Remove least recently used entries until the pool fits max_bytes."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.npy'):
+                try:
+                    stat = os.stat(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    continue  # evicted by another process since listdir()
+                entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass  # another process evicted it first
+            total -= size
+
+    def warm(self, keys, workers=None):
+        """Generate every missing (width, height, algorithm, seed) key in parallel."""
+        missing = [key for key in keys if not os.path.exists(self.path(*key))]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            grids = pool.map(generate_grid, *zip(*missing)) if missing else []
+            for key, grid in zip(missing, grids):
+                self.put(*key, grid)
+        return len(missing)
+
+def _parse_seeds(text):
+    """'0-9' or '3' to a range of seeds."""
+    first, _, last = text.partition('-')
+    return range(int(first), int(last or first) + 1)
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-fill a maze cache directory.")
+    parser.add_argument('directory')
+    parser.add_argument('--sizes', nargs='+', default=['15x12'], help="WIDTHxHEIGHT")
+    parser.add_argument('--seeds', default='0-9', help="seed or FIRST-LAST range")
+    parser.add_argument('--algorithm', default='recursive_backtracking', choices=ALGORITHMS)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--max-mb', type=float, default=256)
+    args = parser.parse_args()
+
+    cache = MazeCache(args.directory, int(args.max_mb * 2**20))
+    sizes = [tuple(int(n) for n in size.split('x')) for size in args.sizes]
+    keys = [(width, height, args.algorithm, seed)
+            for width, height in sizes for seed in _parse_seeds(args.seeds)]
+    generated = cache.warm(keys, args.workers)
+    print(f"Generated {generated} mazes, {len(keys) - generated} already cached")
+
+if __name__ == "__main__":
+    main()
@@ -29,14 +29,16 @@ The grid is represented as a 2D numpy array where:
 DEBUG = False  # for testing
 
 class PerfectMaze:
-    def __init__(self, width, height):
+    def __init__(self, width, height, seed=None):
         """Initialize a maze with given dimensions.
         The maze is represented as a grid where:
         - 1 represents walls
         - 0 represents paths
+        Generation uses the shared numpy random state unless a seed is given.
         """
         self.width = width
         self.height = height
+        self.rng = np.random if seed is None else np.random.RandomState(seed)
         # multiply by 2 and add 1 to account for walls between cells
         self.grid = np.ones((height * 2 + 1, width * 2 + 1), dtype=np.int8)
         
@@ -88,7 +90,7 @@ class PerfectMaze:
                 neighbors.append((new_x, new_y))
             
         # randomly shuffle the neighbors
-        indices = np.random.choice(len(neighbors), len(neighbors), replace=False)
+        indices = self.rng.choice(len(neighbors), len(neighbors), replace=False)
         return [neighbors[i] for i in indices]  # Return list of coordinate tuples
     
     def is_perfect(self):
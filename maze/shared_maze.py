@@ -0,0 +1,163 @@
+import numpy as np
+from multiprocessing import resource_tracker, shared_memory
+
+"""
+Numpy arrays backed by named shared memory segments.
+
+Any process that knows a segment's name, shape and dtype can map the same
+array without copying it. The creating process owns the segment and is
+responsible for closing and unlinking it; other processes only close it.
+
+MazePublisher and MazeSubscriber build on this to share a running
+simulation's grid, pheromones and agents with viewers in other processes.
+"""
+
+def create_shared_array(shape, dtype, name=None):
+    """Allocate a zero-filled array in a new shared memory segment.
+    
+    Returns (segment, array). Keep the segment alive as long as the array
+    is in use, then close() and unlink() it.
+    """
+    dtype = np.dtype(dtype)
+    size = max(1, int(np.prod(shape)) * dtype.itemsize)
+    segment = shared_memory.SharedMemory(name=name, create=True, size=size)
+    array = np.ndarray(shape, dtype=dtype, buffer=segment.buf)
+    array.fill(0)
+    return segment, array
+
+def attach_shared_array(name, shape, dtype, readonly=False, track=True):
+    """Map an existing shared memory segment as an array, zero-copy.
+    
+    Returns (segment, array). Pass track=False from processes outside the
+    owner's process tree, so exiting them can't unlink the owner's segment.
+    """
+    if track:
+        segment = shared_memory.SharedMemory(name=name)
+    else:
+        try:
+            segment = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Python < 3.13 always registers the segment for cleanup
+            segment = shared_memory.SharedMemory(name=name)
+            resource_tracker.unregister(segment._name, 'shared_memory')
+    array = np.ndarray(shape, dtype=dtype, buffer=segment.buf)
+    if readonly:
+        array.flags.writeable = False
+    return segment, array
+
+# Slots of a published maze's header segment. SEQ is a seqlock counter:
+# odd while the publisher is writing, bumped to the next even value after.
+_SEQ, _ROWS, _COLS, _AGENTS, _GOAL_X, _GOAL_Y, _TICK, _CLOSED = range(8)
+_HEADER_SIZE = 8
+# Slots of the float info segment
+_TIME_REMAINING, _FINISH_TIME, _TEMPERATURE = range(3)
+
+class MazePublisher:
+    """Publish a running simulation's state under a shared memory name.
+    
+    Readers (see MazeSubscriber) attach by name from any process and copy
+    out consistent snapshots without ever blocking the publisher.
+    """
+    def __init__(self, name, grid_shape, num_agents, goal):
+        self.name = name
+        self.segments = []
+        self.grid = self._create('grid', grid_shape, np.int8)
+        self.pheromone_grid = self._create('pheromone', grid_shape, np.float64)
+        self.agents = self._create('agents', (num_agents, 2), np.int32)
+        self.info = self._create('info', (3,), np.float64)
+        # header goes last; a nonzero SEQ tells readers everything is there
+        self.header = self._create('header', (_HEADER_SIZE,), np.int64)
+        self.header[_ROWS], self.header[_COLS] = grid_shape
+        self.header[_AGENTS] = num_agents
+        self.header[_GOAL_X], self.header[_GOAL_Y] = goal
+        self.header[_SEQ] = 2
+        
+    def _create(self, part, shape, dtype):
+        segment, array = create_shared_array(shape, dtype, name=f"{self.name}_{part}")
+        self.segments.append(segment)
+        return array
+        
+    def publish(self, maze, agents, tick, time_remaining, finish_time=None):
+        """Copy the current state into shared memory under the seqlock."""
+        self.header[_SEQ] += 1  # odd: write in progress
+        self.grid[:] = maze.grid
+        self.pheromone_grid[:] = maze.pheromone_grid
+        self.agents[:] = [(agent.x, agent.y) for agent in agents]
+        self.info[_TIME_REMAINING] = time_remaining
+        self.info[_FINISH_TIME] = np.nan if finish_time is None else finish_time
+        self.info[_TEMPERATURE] = agents[0].temperature if agents else 0
+        self.header[_TICK] = tick
+        self.header[_SEQ] += 1  # even: consistent again
+        
+    def close(self):
+        """Tell readers the run is over and remove the segments."""
+        self.header[_CLOSED] = 1
+        self.header = self.grid = self.pheromone_grid = self.agents = self.info = None
+        for segment in self.segments:
+            segment.close()
+            segment.unlink()
+        self.segments = []
+
+class MazeSubscriber:
+    """Read-only view of a maze published by MazePublisher."""
+    def __init__(self, name):
+        """Attach to a published maze.
+        
+        Raises FileNotFoundError if nothing is (fully) published under name.
+        """
+        self.name = name
+        self.segments = []
+        self.header = self._attach('header', (_HEADER_SIZE,), np.int64)
+        if self.header[_SEQ] == 0:
+            self.close()
+            raise FileNotFoundError(f"{name} is still being set up")
+        grid_shape = (int(self.header[_ROWS]), int(self.header[_COLS]))
+        self.grid = self._attach('grid', grid_shape, np.int8)
+        self.pheromone_grid = self._attach('pheromone', grid_shape, np.float64)
+        self.agents = self._attach('agents', (int(self.header[_AGENTS]), 2), np.int32)
+        self.info = self._attach('info', (3,), np.float64)
+        self.goal = (int(self.header[_GOAL_X]), int(self.header[_GOAL_Y]))
+        
+    def _attach(self, part, shape, dtype):
+        segment, array = attach_shared_array(f"{self.name}_{part}", shape, dtype,
+                                             readonly=True, track=False)
+        self.segments.append(segment)
+        return array
+        
+    @property
+    def closed(self):
+        """Whether the publisher has finished its run."""
+        return bool(self.header[_CLOSED])
+        
+    def snapshot(self, retries=100):
+        """Copy out a consistent state, or return None if the publisher kept
+        writing through every retry.
+        
+        The result is a dict with 'tick', 'grid', 'pheromone_grid', 'agents'
+        ((x, y) rows), 'time_remaining', 'finish_time' and 'temperature'.
+        """
+        for _ in range(retries):
+            start = self.header[_SEQ]
+            if start % 2:
+                continue
+            state = {
+                'tick': int(self.header[_TICK]),
+                'grid': self.grid.copy(),
+                'pheromone_grid': self.pheromone_grid.copy(),
+                'agents': self.agents.copy(),
+                'time_remaining': float(self.info[_TIME_REMAINING]),
+                'finish_time': float(self.info[_FINISH_TIME]),
+                'temperature': float(self.info[_TEMPERATURE]),
+            }
+            if self.header[_SEQ] == start:
+                if np.isnan(state['finish_time']):
+                    state['finish_time'] = None
+                return state
+        return None
+        
+    def close(self):
+        """Detach; the publisher and other readers are unaffected."""
+        self.header = self.grid = self.pheromone_grid = self.agents = self.info = None
+        for segment in self.segments:
+            segment.close()
+        self.segments = []
@@ -0,0 +1,79 @@
+import unittest
+import numpy as np
+from agents.agent import Agent
+from maze.dynamic_maze import DynamicMaze
+from visualization.simulation import Simulation
+
+class TestMaxMinAntSystem(unittest.TestCase):
+    def setUp(self):
+        self.maze = DynamicMaze(5, 5, change_probability=0.0, seed=3)
+        self.maze.generate()
+        self.maze.grid[1:-1, 1:-1] = 0  # open room
+        self.maze.load_grid(self.maze.grid)
+        self.mmas = {'update_rule': 'mmas', 'tau_min': 0.1, 'tau_max': 4.0,
+                     'elitist_deposit': 2.0}
+
+    def _walk(self, agent, cells):
+        for x, y in cells:
+            agent.x, agent.y = x, y
+            agent.current_distance = agent._manhattan_distance(x, y, agent.goal_x, agent.goal_y)
+            agent.aco.leave_pheromone(agent, self.maze)
+
+    def test_trail_erases_loops(self):
+        """Test that walking in a loop leaves it off the recorded trail"""
+        agent = Agent(1, 1, 5, 1, config={'aco': self.mmas})
+        self._walk(agent, [(2, 1), (2, 2), (1, 2), (1, 1), (2, 1), (3, 1)])
+        self.assertEqual(agent.trail, [(1, 1), (2, 1), (3, 1)])
+
+    def test_elitist_deposit_on_arrival(self):
+        """Test that arriving lays deposits along the trail, scaled by length"""
+        agent = Agent(1, 1, 4, 1, config={'aco': self.mmas})
+        self._walk(agent, [(2, 1), (3, 1)])
+        before = self.maze.pheromone_grid.copy()
+        self._walk(agent, [(4, 1)])
+        added = self.maze.pheromone_grid - before
+        np.testing.assert_allclose(added[1, 1:4], [2.0 / 3] * 3)
+        # the goal also gets the regular progress deposit
+        self.assertAlmostEqual(added[1, 4], 2.0 / 3 + 0.6)
+
+    def test_bounds_enforced(self):
+        """Test that deposits and decay keep the trail within the bounds"""
+        agent = Agent(1, 1, 2, 1, config={'aco': self.mmas})
+        self.maze.pheromone_bounds = agent.aco.pheromone_bounds()
+        self.assertEqual(self.maze.pheromone_bounds, (0.1, 4.0))
+        self.maze.pheromone_grid[1, 2] = 3.9
+        self._walk(agent, [(2, 1)])
+        self.assertEqual(self.maze.pheromone_grid[1, 2], 4.0)
+        self.maze.update()
+        self.assertEqual(self.maze.pheromone_grid.min(), 0.1)
+        self.assertAlmostEqual(self.maze.pheromone_grid[1, 2], 4.0 * self.maze.evaporation_rate)
+
+    def test_stagnation_reset(self):
+        """Test that a stagnated trail is wiped back to the lower bound"""
+        config = {
+            'maze_size': (6, 6),
+            'num_agents': 4,
+            'wall_change_interval': 30,
+            'wall_change_probability': 0.0,
+            'fps': 30,
+            'simulation_time': 60,
+            'headless': True,
+            'max_ticks': 1500,
+            'aco': {'update_rule': 'mmas', 'stagnation_reset_ticks': 20},
+        }
+        np.random.seed(0)
+        sim = Simulation(config)
+        tau_min = sim.maze.pheromone_bounds[0]
+        self.assertTrue((sim.maze.pheromone_grid == tau_min).all())
+        results = sim.run()
+        self.assertGreater(results['trail_resets'], 0)
+        
+        # agents reaching the goal without laying a trail never stagnate
+        config['aco'].update(pheromone_strength=0.0, elitist_deposit=0.0)
+        np.random.seed(0)
+        results = Simulation(config).run()
+        self.assertIsNotNone(results['finish_tick'])
+        self.assertEqual(results['trail_resets'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
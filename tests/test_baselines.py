@@ -0,0 +1,79 @@
+import unittest
+import numpy as np
+from maze.dynamic_maze import DynamicMaze
+from agents.baselines import AStarAgent, BFSAgent, WallFollowerAgent
+
+class TestBaselines(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(4)
+        self.maze = DynamicMaze(6, 6, change_probability=0.0)
+        self.maze.generate()
+        self.goal = (11, 11)
+
+    def _walk(self, agent, steps=2000):
+        """Move an agent until it reaches the goal; return the steps taken."""
+        for step in range(steps):
+            if (agent.x, agent.y) == self.goal:
+                return step
+            agent.move(self.maze, [agent], 10)
+        return None
+
+    def test_planners_take_shortest_path(self):
+        """Test that BFS and A* agents walk the unique path of a perfect maze"""
+        # distance along the only path, from a plain BFS of the grid
+        shortest = len(BFSAgent(1, 1, *self.goal)._plan(self.maze))
+        for agent_class in (BFSAgent, AStarAgent):
+            with self.subTest(agent=agent_class.__name__):
+                agent = agent_class(1, 1, *self.goal)
+                self.assertEqual(self._walk(agent), shortest)
+                self.assertEqual(agent.replans, 0)
+
+    def test_replan_on_wall_change(self):
+        """Test that planners replan once the maze has changed"""
+        agent = AStarAgent(1, 1, *self.goal)
+        agent.move(self.maze, [agent], 10)
+        self.maze.change_probability = 0.2
+        self.maze.update()
+        agent.move(self.maze, [agent], 10)
+        self.assertEqual(agent.replans, 1)
+        self.assertIsNotNone(self._walk(agent))
+
+    def test_no_replan_for_distant_change(self):
+        """Test that walls closing away from the path don't trigger a replan"""
+        agent = BFSAgent(1, 1, *self.goal)
+        agent.move(self.maze, [agent], 10)
+        near = set(agent.path) | {(agent.x, agent.y)}
+        far = [(x, y) for y in range(1, 12) for x in range(1, 12)
+               if self.maze.grid[y, x] == 1 and
+               all((x + dx, y + dy) not in near
+                   for dx, dy in [(0, 0), (0, 1), (1, 0), (0, -1), (-1, 0)])]
+        self.maze.changed_cells = far[:1]
+        self.maze.version += 1
+        agent.move(self.maze, [agent], 10)
+        self.assertEqual(agent.replans, 0)
+        
+        # one closing next to the path does
+        x, y = agent.path[0]
+        self.maze.changed_cells = [next((x + dx, y + dy) for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]
+                                        if self.maze.grid[y + dy, x + dx] == 1)]
+        self.maze.version += 1
+        agent.move(self.maze, [agent], 10)
+        self.assertEqual(agent.replans, 1)
+        
+        # and so does one opening anywhere, as it may make a shortcut
+        x, y = far[0]
+        self.maze.grid[y, x] = 0
+        self.maze.rebuild_move_mask()
+        self.maze.changed_cells = [(x, y)]
+        self.maze.version += 1
+        agent.move(self.maze, [agent], 10)
+        self.assertEqual(agent.replans, 2)
+
+    def test_wall_follower_solves_perfect_maze(self):
+        """Test that the right-hand rule gets through a perfect maze"""
+        agent = WallFollowerAgent(1, 1, *self.goal)
+        self.assertIsNotNone(self._walk(agent))
+        self.assertEqual(self.maze.grid[agent.y, agent.x], 0)
+
+if __name__ == '__main__':
+    unittest.main()
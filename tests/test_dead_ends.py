@@ -0,0 +1,63 @@
+import unittest
+import numpy as np
+from maze.dynamic_maze import DynamicMaze, MASK_MOVES
+from maze.dead_ends import DeadEndIndex
+
+class TestDeadEndIndex(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(11)
+        self.maze = DynamicMaze(30, 25, change_probability=0.05)
+        self.maze.generate()
+        self.colony = (1, 1)
+        self.goal = (59, 49)
+
+    def _path(self):
+        """The unique colony-to-goal path of the perfect maze."""
+        parents = {self.colony: None}
+        stack = [self.colony]
+        while stack:
+            x, y = stack.pop()
+            for dx, dy in MASK_MOVES[self.maze.move_mask[y, x]]:
+                if (x + dx, y + dy) not in parents:
+                    parents[(x + dx, y + dy)] = (x, y)
+                    stack.append((x + dx, y + dy))
+        path, cell = set(), self.goal
+        while cell is not None:
+            path.add(cell)
+            cell = parents[cell]
+        return path
+
+    def test_perfect_maze_leaves_only_the_path(self):
+        """Test that filling a perfect maze leaves just the colony-goal path"""
+        index = DeadEndIndex(self.maze, protected=[self.colony, self.goal])
+        ys, xs = np.nonzero((self.maze.grid == 0) & ~index.dead)
+        self.assertEqual(set(zip(xs.tolist(), ys.tolist())), self._path())
+        self.assertFalse(index.dead[self.maze.grid == 1].any())
+
+    def test_incremental_update_matches_rebuild(self):
+        """Test that refilling after wall changes equals filling from scratch"""
+        index = DeadEndIndex(self.maze, protected=[self.colony, self.goal])
+        self.maze.dead_ends = index
+        for _ in range(5):
+            self.maze.update()
+            fresh = DeadEndIndex(self.maze, protected=[self.colony, self.goal])
+            np.testing.assert_array_equal(index.dead, fresh.dead)
+
+    def test_moves_lead_out_of_dead_ends(self):
+        """Test that only moves deeper into a dead end count as useless"""
+        index = DeadEndIndex(self.maze, protected=[self.colony, self.goal])
+        path = self._path()
+        ys, xs = np.nonzero(index.dead)
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            # exactly one way out of every dead cell of a perfect maze
+            moves = MASK_MOVES[self.maze.move_mask[y, x]]
+            exits = [(dx, dy) for dx, dy in moves
+                     if not index.is_useless_move(x, y, x + dx, y + dy)]
+            self.assertEqual(len(exits), 1)
+        for x, y in path:
+            for dx, dy in MASK_MOVES[self.maze.move_mask[y, x]]:
+                self.assertEqual(index.is_useless_move(x, y, x + dx, y + dy),
+                                 (x + dx, y + dy) not in path)
+
+if __name__ == '__main__':
+    unittest.main()
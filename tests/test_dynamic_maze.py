@@ -1,6 +1,6 @@
 import unittest
 import numpy as np
-from maze.dynamic_maze import DynamicMaze
+from maze.dynamic_maze import DynamicMaze, MASK_MOVES
 
 class TestDynamicMaze(unittest.TestCase):
     def setUp(self):
@@ -34,5 +34,68 @@ class TestDynamicMaze(unittest.TestCase):
         self.assertTrue(np.all(self.maze.grid[:, 0] == 1))  # left
         self.assertTrue(np.all(self.maze.grid[:, -1] == 1))  # right
 
+    def test_move_mask_tracks_wall_changes(self):
+        """Test that patched move masks match a full rebuild after updates"""
+        maze = DynamicMaze(8, 8, change_probability=0.2)
+        maze.generate()
+        for _ in range(5):
+            maze.update()
+            patched = maze.move_mask.copy()
+            maze.rebuild_move_mask()
+            np.testing.assert_array_equal(patched, maze.move_mask)
+            
+        # every move in the mask leads to an open cell
+        for y in range(1, maze.grid.shape[0] - 1):
+            for x in range(1, maze.grid.shape[1] - 1):
+                for dx, dy in MASK_MOVES[maze.move_mask[y, x]]:
+                    self.assertEqual(maze.grid[y + dy, x + dx], 0)
+                    
+        # gathered lookups match single ones
+        xs, ys = np.array([1, 3, 5]), np.array([1, 1, 3])
+        np.testing.assert_array_equal(maze.open_moves(xs, ys), maze.move_mask[ys, xs])
+
+    def test_extract_best_path(self):
+        """Test that the strongest pheromone trail is followed to the goal"""
+        maze = DynamicMaze(2, 2, change_probability=0.0)
+        # a loop around the center wall: two routes from (1,1) to (3,3)
+        maze.grid[1:4, 1:4] = 0
+        maze.grid[2, 2] = 1
+        maze.rebuild_move_mask()
+        left = [(1, 2), (1, 3), (2, 3)]
+        top = [(2, 1), (3, 1), (3, 2)]
+        for x, y in left:
+            maze.pheromone_grid[y, x] = 0.5
+        for x, y in top:
+            maze.pheromone_grid[y, x] = 0.2
+        maze.pheromone_grid[3, 3] = 1.0
+        self.assertEqual(maze.extract_best_path((1, 1), (3, 3)), [(1, 1)] + left + [(3, 3)])
+        
+        # strengthen the other route and the path follows it
+        for x, y in top:
+            maze.pheromone_grid[y, x] = 0.9
+        self.assertEqual(maze.extract_best_path((1, 1), (3, 3)), [(1, 1)] + top + [(3, 3)])
+        
+        # no path once the goal is walled off
+        maze.grid[3, 2] = maze.grid[2, 3] = 1
+        maze.rebuild_move_mask()
+        self.assertEqual(maze.extract_best_path((1, 1), (3, 3)), [])
+
+    def test_extract_best_path_needs_a_trail(self):
+        """Test that an open route without pheromone on it is no path"""
+        maze = DynamicMaze(2, 2, change_probability=0.0)
+        maze.grid[1:4, 1:4] = 0
+        maze.grid[2, 2] = 1
+        maze.rebuild_move_mask()
+        self.assertEqual(maze.extract_best_path((1, 1), (3, 3)), [])
+        
+        # a trail that stops two cells short of the goal doesn't reach it either
+        maze.pheromone_grid[2, 1] = 0.5
+        maze.pheromone_grid[3, 3] = 1.0
+        self.assertEqual(maze.extract_best_path((1, 1), (3, 3)), [])
+        
+        # nor does pheromone spread evenly over every cell
+        maze.pheromone_grid[:] = 1.0
+        self.assertEqual(maze.extract_best_path((1, 1), (3, 3)), [])
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
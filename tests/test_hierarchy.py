@@ -0,0 +1,58 @@
+import unittest
+from collections import deque
+import numpy as np
+from maze.dynamic_maze import DynamicMaze, MASK_MOVES
+from maze.hierarchy import ClusterHierarchy
+
+class TestClusterHierarchy(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(5)
+        self.maze = DynamicMaze(12, 10, change_probability=0.05)
+        self.maze.generate()
+        self.goal = (21, 17)
+
+    def _true_distances(self):
+        """Plain BFS distances from the goal over the whole grid."""
+        distances = {self.goal: 0}
+        queue = deque([self.goal])
+        while queue:
+            x, y = queue.popleft()
+            for dx, dy in MASK_MOVES[self.maze.move_mask[y, x]]:
+                if (x + dx, y + dy) not in distances:
+                    distances[(x + dx, y + dy)] = distances[(x, y)] + 1
+                    queue.append((x + dx, y + dy))
+        return distances
+
+    def test_exact_on_perfect_maze(self):
+        """Test that a perfect maze's estimate is the true distance"""
+        hierarchy = ClusterHierarchy(self.maze, self.goal, cluster_size=6)
+        self.assertEqual(hierarchy.num_clusters, (4, 5))
+        for (x, y), distance in self._true_distances().items():
+            self.assertEqual(hierarchy.goal_distance(x, y), distance)
+
+    def test_incremental_update_matches_rebuild(self):
+        """Test that patching after wall changes equals building from scratch"""
+        hierarchy = ClusterHierarchy(self.maze, self.goal, cluster_size=6)
+        self.maze.hierarchy = hierarchy
+        for _ in range(4):
+            self.maze.update()
+        fresh = ClusterHierarchy(self.maze, self.goal, cluster_size=6)
+        self.assertEqual(hierarchy.entrances, fresh.entrances)
+        self.assertEqual(hierarchy.node_distance, fresh.node_distance)
+        
+        # estimates never undercut the true distance
+        true = self._true_distances()
+        for (x, y), distance in true.items():
+            self.assertGreaterEqual(hierarchy.goal_distance(x, y), distance)
+
+    def test_cluster_pheromone(self):
+        """Test cluster-level deposits and evaporation"""
+        hierarchy = ClusterHierarchy(self.maze, self.goal, cluster_size=6)
+        hierarchy.deposit(np.array([1, 2, 7]), np.array([1, 3, 1]), np.array([0.5, 0.5, 1.0]))
+        self.assertEqual(hierarchy.pheromone_at(4, 4), 1.0)
+        self.assertEqual(hierarchy.pheromone_at(1, 8), 1.0)
+        hierarchy.evaporate(0.5)
+        self.assertEqual(hierarchy.pheromone_at(0, 0), 0.5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from agents.agent import Agent
+from maze.dynamic_maze import DynamicMaze, MOVE_DIRECTIONS
+from maze.junction_graph import JunctionGraph
+
+class TestJunctionGraph(unittest.TestCase):
+    def setUp(self):
+        self.maze = DynamicMaze(15, 12, change_probability=0.08, seed=4)
+        self.maze.generate()
+        self.protected = [(1, 1), (29, 23)]
+
+    def _summary(self, graph):
+        return {node: {direction: (end, cells) for direction, (end, cells, _) in edges.items()}
+                for node, edges in graph.edges.items()}
+
+    def test_contraction(self):
+        """Test that every open cell is a node or on exactly one corridor"""
+        graph = JunctionGraph(self.maze, protected=self.protected)
+        for cell in self.protected:
+            self.assertIn(cell, graph.edges)
+        open_cells = int((self.maze.grid == 0).sum())
+        self.assertEqual(len(graph.edges) + len(graph.corridor), open_cells)
+        # a perfect maze is a tree: one edge fewer than nodes
+        num_edges = sum(len(edges) for edges in graph.edges.values()) // 2
+        self.assertEqual(num_edges, len(graph.edges) - 1)
+        
+        for node, edges in graph.edges.items():
+            for direction, (end, cells, (ys, xs)) in edges.items():
+                self.assertEqual(cells[-1], end)
+                self.assertEqual(list(zip(xs.tolist(), ys.tolist())), cells)
+                # consecutive cells are one open step apart
+                x, y = node
+                for cx, cy in cells:
+                    self.assertIn((cx - x, cy - y), MOVE_DIRECTIONS)
+                    self.assertEqual(self.maze.grid[cy, cx], 0)
+                    x, y = cx, cy
+
+    def test_incremental_update_matches_rebuild(self):
+        """Test that re-tracing after wall changes equals contracting from scratch"""
+        graph = JunctionGraph(self.maze, protected=self.protected)
+        self.maze.junctions = graph
+        for _ in range(8):
+            self.maze.update()
+            fresh = JunctionGraph(self.maze, protected=self.protected)
+            self.assertEqual(self._summary(graph), self._summary(fresh))
+            self.assertEqual(graph.corridor.keys(), fresh.corridor.keys())
+
+    def test_agent_takes_whole_corridor(self):
+        """Test that an agent on a junction walks a corridor in one move"""
+        graph = JunctionGraph(self.maze, protected=self.protected)
+        self.maze.junctions = graph
+        start = self.protected[0]
+        agent = Agent(*start, *self.protected[1])
+        agent.move(self.maze, [agent], time_remaining=10)
+        self.assertIn((agent.x, agent.y), graph.edges)
+        corridor = next(cells for end, cells, _ in graph.edges[start].values()
+                        if end == (agent.x, agent.y))
+        previous = ([start] + corridor)[-2]
+        self.assertEqual((agent.vx, agent.vy), (agent.x - previous[0], agent.y - previous[1]))
+        self.assertEqual(agent.junction_visits, {(agent.x, agent.y): 1})
+        # pheromone went down along the corridor, not just at its end
+        if len(corridor) > 1:
+            self.assertNotEqual(self.maze.pheromone_grid[corridor[-2][1], corridor[-2][0]], 0)
+
+if __name__ == '__main__':
+    unittest.main()
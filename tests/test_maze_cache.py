@@ -0,0 +1,71 @@
+import unittest
+import os
+import tempfile
+import time
+import numpy as np
+from maze.dynamic_maze import DynamicMaze
+from maze.maze_cache import MazeCache, generate_grid
+
+class TestMazeCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = MazeCache(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_round_trip(self):
+        """Test that a cached grid loads back exactly as generated"""
+        self.assertIsNone(self.cache.get(7, 5, seed=3))
+        grid = self.cache.load(7, 5, seed=3)
+        cached = self.cache.get(7, 5, seed=3)
+        np.testing.assert_array_equal(grid, cached)
+        self.assertEqual(cached.dtype, np.int8)
+        
+        # same key, same maze as generating from the seed
+        np.testing.assert_array_equal(cached, generate_grid(7, 5, seed=3))
+        # bit-packed on disk
+        size = os.path.getsize(self.cache.path(7, 5, 'recursive_backtracking', 3))
+        self.assertLess(size, cached.size)
+
+    def test_loaded_maze_matches_generated(self):
+        """Test that a maze built from the cache evolves like a generated one"""
+        generated = DynamicMaze(6, 6, change_probability=0.1, seed=9)
+        generated.generate()
+        loaded = DynamicMaze(6, 6, change_probability=0.1, seed=9)
+        loaded.load_grid(self.cache.load(6, 6, seed=9))
+        self.assertEqual(generated.changeable_walls, loaded.changeable_walls)
+        for _ in range(3):
+            generated.update()
+            loaded.update()
+        np.testing.assert_array_equal(generated.grid, loaded.grid)
+        np.testing.assert_array_equal(generated.move_mask, loaded.move_mask)
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entries go first"""
+        for seed in range(3):
+            self.cache.load(10, 10, seed=seed)
+        entry_size = os.path.getsize(self.cache.path(10, 10, 'recursive_backtracking', 0))
+        # make seed 0 the oldest entry, then touch it so seed 1 is
+        for seed in range(3):
+            path = self.cache.path(10, 10, 'recursive_backtracking', seed)
+            os.utime(path, (time.time() - 100 + seed, time.time() - 100 + seed))
+        self.cache.get(10, 10, seed=0)
+        
+        self.cache.max_bytes = 2 * entry_size
+        self.cache.evict()
+        self.assertIsNotNone(self.cache.get(10, 10, seed=0))
+        self.assertIsNone(self.cache.get(10, 10, seed=1))
+        self.assertIsNotNone(self.cache.get(10, 10, seed=2))
+
+    def test_warm(self):
+        """Test that warming generates only missing entries"""
+        self.cache.load(4, 4, seed=0)
+        keys = [(4, 4, 'recursive_backtracking', seed) for seed in range(3)]
+        self.assertEqual(self.cache.warm(keys, workers=2), 2)
+        for seed in range(3):
+            np.testing.assert_array_equal(self.cache.get(4, 4, seed=seed),
+                                          generate_grid(4, 4, seed=seed))
+
+if __name__ == '__main__':
+    unittest.main()
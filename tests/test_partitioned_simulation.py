@@ -0,0 +1,69 @@
+import unittest
+import os
+import numpy as np
+from maze.shared_maze import MazeSubscriber
+from visualization.partitioned_simulation import PartitionedSimulation
+
+class TestPartitionedSimulation(unittest.TestCase):
+    def setUp(self):
+        self.config = {
+            'maze_size': (8, 8),
+            'num_agents': 10,
+            'wall_change_interval': 5,
+            'wall_change_probability': 0.05,
+            'fps': 30,
+            'simulation_time': 60,
+            'max_ticks': 60,
+            'num_workers': 3,
+            'seed': 11,
+        }
+
+    def _run(self):
+        np.random.seed(2)
+        sim = PartitionedSimulation(self.config)
+        return sim, sim.run()
+
+    def test_run_keeps_maze_consistent(self):
+        """Test that strips stitch back into one valid maze"""
+        sim, results = self._run()
+        self.assertEqual(results['ticks'], 60)
+        self.assertEqual(len(sim.agents), 10)
+        
+        # outer walls untouched and move masks agree with the grid
+        grid = sim.maze.grid
+        self.assertTrue(np.all(grid[0, :] == 1) and np.all(grid[-1, :] == 1))
+        self.assertTrue(np.all(grid[:, 0] == 1) and np.all(grid[:, -1] == 1))
+        patched = sim.maze.move_mask.copy()
+        sim.maze.rebuild_move_mask()
+        np.testing.assert_array_equal(patched, sim.maze.move_mask)
+
+    def test_repeatable_with_seed(self):
+        """Test that the same seed gives the same run"""
+        first, _ = self._run()
+        second, _ = self._run()
+        np.testing.assert_array_equal(first.maze.grid, second.maze.grid)
+        np.testing.assert_array_equal(first.maze.pheromone_grid, second.maze.pheromone_grid)
+        self.assertEqual([(a.x, a.y) for a in first.agents],
+                         [(a.x, a.y) for a in second.agents])
+
+    def test_too_many_workers(self):
+        """Test that strips thinner than two rows are rejected"""
+        self.config['num_workers'] = 10
+        with self.assertRaises(ValueError):
+            PartitionedSimulation(self.config)
+
+    def test_unsupported_options(self):
+        """Test that options the workers can't honor are rejected"""
+        name = f"test_partitioned_{os.getpid()}"
+        with self.assertRaises(ValueError):
+            PartitionedSimulation(dict(self.config, publish_name=name))
+        # nothing was left in shared memory
+        with self.assertRaises(FileNotFoundError):
+            MazeSubscriber(name)
+        for option in ({'trajectory_window': 16}, {'cluster_size': 4},
+                       {'prune_dead_ends': True}):
+            with self.subTest(option=option), self.assertRaises(ValueError):
+                PartitionedSimulation(dict(self.config, **option))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+import os
+import subprocess
+import sys
+import numpy as np
+from maze.dynamic_maze import DynamicMaze
+from maze.shared_maze import MazePublisher, MazeSubscriber
+from visualization.simulation import Simulation
+
+class TestSharedMaze(unittest.TestCase):
+    def setUp(self):
+        self.name = f"test_maze_{os.getpid()}"
+        self.maze = DynamicMaze(4, 4)
+        self.maze.generate()
+        self.maze.pheromone_grid[1, 1] = 0.5
+        self.sim = Simulation({
+            'maze_size': (4, 4), 'num_agents': 3, 'wall_change_interval': 10,
+            'wall_change_probability': 0.0, 'fps': 30, 'simulation_time': 10,
+            'headless': True,
+        })
+
+    def test_publish_and_snapshot(self):
+        """Test that a subscriber sees exactly what was published"""
+        publisher = MazePublisher(self.name, self.maze.grid.shape, 3, (7, 7))
+        try:
+            publisher.publish(self.maze, self.sim.agents, 5, 8.0)
+            subscriber = MazeSubscriber(self.name)
+            state = subscriber.snapshot()
+            self.assertEqual(state['tick'], 5)
+            np.testing.assert_array_equal(state['grid'], self.maze.grid)
+            np.testing.assert_array_equal(state['pheromone_grid'], self.maze.pheromone_grid)
+            self.assertEqual([tuple(p) for p in state['agents']],
+                             [(a.x, a.y) for a in self.sim.agents])
+            self.assertIsNone(state['finish_time'])
+            self.assertEqual(subscriber.goal, (7, 7))
+            
+            # readers can't write into the run
+            with self.assertRaises(ValueError):
+                subscriber.grid[0, 0] = 0
+            subscriber.close()
+        finally:
+            publisher.close()
+
+    def test_torn_write_is_retried(self):
+        """Test that a snapshot never returns a half-written state"""
+        publisher = MazePublisher(self.name, self.maze.grid.shape, 3, (7, 7))
+        try:
+            subscriber = MazeSubscriber(self.name)
+            publisher.header[0] += 1  # publisher stuck mid-write
+            self.assertIsNone(subscriber.snapshot(retries=3))
+            publisher.header[0] += 1
+            self.assertIsNotNone(subscriber.snapshot())
+            subscriber.close()
+        finally:
+            publisher.close()
+
+    def test_detached_reader_process(self):
+        """Test that a reader process exiting leaves the segments in place"""
+        publisher = MazePublisher(self.name, self.maze.grid.shape, 3, (7, 7))
+        try:
+            publisher.publish(self.maze, self.sim.agents, 1, 9.0)
+            code = ("from maze.shared_maze import MazeSubscriber; "
+                    f"s = MazeSubscriber('{self.name}'); print(s.snapshot()['tick']); s.close()")
+            root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            output = subprocess.run([sys.executable, '-c', code], cwd=root,
+                                    capture_output=True, text=True, check=True)
+            self.assertEqual(output.stdout.strip(), '1')
+            subscriber = MazeSubscriber(self.name)
+            self.assertEqual(subscriber.snapshot()['tick'], 1)
+            subscriber.close()
+        finally:
+            publisher.close()
+
+    def test_interrupted_run_unlinks(self):
+        """Test that segments only exist while a run is going, even one cut short"""
+        sim = Simulation({
+            'maze_size': (4, 4), 'num_agents': 3, 'wall_change_interval': 10,
+            'wall_change_probability': 0.0, 'fps': 30, 'simulation_time': 10,
+            'headless': True, 'publish_name': self.name,
+        })
+        # nothing is published before the run starts
+        with self.assertRaises(FileNotFoundError):
+            MazeSubscriber(self.name)
+        def interrupt():
+            raise KeyboardInterrupt
+        sim._step = interrupt
+        with self.assertRaises(KeyboardInterrupt):
+            sim.run()
+        self.assertIsNone(sim.publisher)
+        with self.assertRaises(FileNotFoundError):
+            MazeSubscriber(self.name)
+
+if __name__ == '__main__':
+    unittest.main()
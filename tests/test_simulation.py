@@ -0,0 +1,126 @@
+import unittest
+import numpy as np
+from visualization.simulation import Simulation
+
+class TestSimulation(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.config = {
+            'maze_size': (6, 6),
+            'num_agents': 4,
+            'wall_change_interval': 30,
+            'wall_change_probability': 0.0,
+            'fps': 30,
+            'simulation_time': 60,
+            'headless': True,
+        }
+
+    def test_headless_tick_budget(self):
+        """Test that a headless run stops at the tick budget"""
+        self.config['max_ticks'] = 25
+        results = Simulation(self.config).run()
+        self.assertEqual(results['ticks'], 25)
+        self.assertEqual(results['stop_reason'], 'tick_budget')
+
+    def test_headless_time_up(self):
+        """Test that a headless run ends when simulation time runs out"""
+        self.config['simulation_time'] = 1
+        results = Simulation(self.config).run()
+        self.assertEqual(results['stop_reason'], 'time_up')
+        self.assertEqual(results['ticks'], self.config['fps'] + 1)
+
+    def test_first_arrival(self):
+        """Test that a run stops as soon as an agent reaches the goal"""
+        self.config['stop_on'] = 'first_arrival'
+        self.config['max_ticks'] = 5000
+        sim = Simulation(self.config)
+        results = sim.run()
+        self.assertEqual(results['stop_reason'], 'first_arrival')
+        self.assertEqual(results['finish_tick'], results['ticks'] - 1)
+        self.assertGreaterEqual(results['arrived'], 1)
+
+    def test_converged_path(self):
+        """Test that convergence yields a path from colony to goal"""
+        self.config['stop_on'] = ['converged']
+        self.config['convergence_ticks'] = 10
+        self.config['max_ticks'] = 5000
+        sim = Simulation(self.config)
+        results = sim.run()
+        self.assertEqual(results['stop_reason'], 'converged')
+        path = results['best_path']
+        self.assertEqual(path[0], sim.colony_pos)
+        self.assertEqual(path[-1], sim.goal_pos)
+        self.assertEqual(results['best_path_length'], len(path) - 1)
+        # the path runs along the trail, not just through open cells:
+        # at most single cells without pheromone bridge it
+        trail = [sim.maze.pheromone_grid[y, x] != 0 for x, y in path]
+        self.assertTrue(all(a or b for a, b in zip(trail, trail[1:])))
+
+    def test_no_convergence_without_trail(self):
+        """Test that a run without pheromone never counts as converged"""
+        self.config['stop_on'] = ['converged']
+        self.config['convergence_ticks'] = 10
+        self.config['max_ticks'] = 300
+        self.config['aco'] = {'pheromone_strength': 0.0}
+        sim = Simulation(self.config)
+        results = sim.run()
+        self.assertIsNotNone(results['finish_tick'])
+        self.assertEqual(results['stop_reason'], 'tick_budget')
+        self.assertEqual(results['best_path'], [])
+
+    def test_synchronous_independent_of_workers(self):
+        """Test that synchronous runs match for any number of workers"""
+        self.config.update({'synchronous': True, 'seed': 7, 'max_ticks': 40,
+                            'wall_change_probability': 0.05})
+        runs = []
+        for workers in (1, 3):
+            np.random.seed(0)
+            sim = Simulation(dict(self.config, num_workers=workers))
+            sim.run()
+            runs.append(sim)
+        first, second = runs
+        self.assertEqual([(a.x, a.y) for a in first.agents],
+                         [(a.x, a.y) for a in second.agents])
+        np.testing.assert_array_equal(first.maze.pheromone_grid,
+                                      second.maze.pheromone_grid)
+        
+    def test_synchronous_reads_previous_tick(self):
+        """Test that deposits only show up once the tick is over"""
+        self.config.update({'synchronous': True, 'seed': 1})
+        sim = Simulation(self.config)
+        sim.start_time = 0
+        sim.maze.pheromone_grid[:] = 0
+        seen = []
+        original = sim.agents[1].move
+        def move(maze, agents, time_remaining, deposits=None):
+            seen.append(maze.pheromone_grid.sum())
+            original(maze, agents, time_remaining, deposits)
+        sim.agents[1].move = move
+        # (first steps deposit nothing, distances are only updated next move)
+        sim._update_simulation()
+        sim.maze.pheromone_grid[:] = 0
+        seen.clear()
+        sim._update_simulation()
+        self.assertEqual(seen, [0])
+        self.assertGreater(np.abs(sim.maze.pheromone_grid).sum(), 0)
+
+    def test_sim_rate_independent_of_fps(self):
+        """Test that a fast sim rate runs many ticks per drawn frame"""
+        self.config.update({'headless': False, 'sim_rate': 3000, 'max_ticks': 600})
+        sim = Simulation(self.config)
+        draws = []
+        sim.visualizer.draw = lambda *args: draws.append(sim.frame_count)
+        results = sim.run()
+        self.assertEqual(results['ticks'], 600)
+        self.assertLess(len(draws), 100)
+        # annealing follows simulated time, not wall-clock time
+        self.assertAlmostEqual(sim.time_remaining, 60 - 599 / 3000)
+
+    def test_unknown_stop_condition(self):
+        """Test that a typo in stop_on is rejected"""
+        self.config['stop_on'] = 'first_arival'
+        with self.assertRaises(ValueError):
+            Simulation(self.config)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+import tempfile
+from types import SimpleNamespace
+import numpy as np
+from agents.trajectory import TrajectoryRecorder
+
+class TestTrajectoryRecorder(unittest.TestCase):
+    def setUp(self):
+        # two agents on a 5x5 grid: one walks right and back, one stays put
+        self.recorder = TrajectoryRecorder(2, (5, 5), window=4, goal=(3, 1))
+        self.steps = [
+            # (xs, ys, directions); directions index MOVE_DIRECTIONS
+            ([1, 1], [1, 3], [-1, -1]),
+            ([2, 1], [1, 3], [1, -1]),   # right
+            ([1, 1], [1, 3], [3, -1]),   # left, a backtrack
+            ([2, 1], [1, 3], [1, -1]),   # right, another backtrack
+            ([3, 1], [1, 3], [1, -1]),   # right, reaches the goal
+        ]
+
+    def _record_all(self):
+        for xs, ys, directions in self.steps:
+            self.recorder.record(np.array(xs), np.array(ys), np.array(directions))
+
+    def test_window_wraps(self):
+        """Test that only the last window of ticks is kept, in order"""
+        self._record_all()
+        xs, ys, directions = self.recorder.recent()
+        self.assertEqual(xs.shape, (4, 2))
+        self.assertEqual(xs.dtype, np.int16)
+        np.testing.assert_array_equal(xs[:, 0], [2, 1, 2, 3])
+
+    def test_run_statistics(self):
+        """Test visit counts, backtracks and arrival ticks over the whole run"""
+        self._record_all()
+        self.assertEqual(self.recorder.visit_counts[3, 1], 5)
+        self.assertEqual(self.recorder.visit_counts[1, 2], 2)
+        np.testing.assert_allclose(self.recorder.backtrack_frequency(), [0.5, 0])
+        np.testing.assert_array_equal(self.recorder.time_to_goal(), [4])
+
+    def test_loop_frequency(self):
+        """Test that returning to a cell in the window counts as a loop"""
+        self._record_all()
+        # window holds x = 2, 1, 2, 3: three moves, one back onto x = 2
+        np.testing.assert_allclose(self.recorder.loop_frequency(), [1 / 3, 0])
+
+    def test_passed_cells_count_as_visits(self):
+        """Test that cells walked through in one move (junction moves) are counted"""
+        agents = [SimpleNamespace(x=3, y=1, vx=1, vy=0, passed_cells=[(1, 1), (2, 1)]),
+                  SimpleNamespace(x=1, y=3, vx=0, vy=0)]
+        self.recorder.record_agents(agents)
+        self.assertEqual(self.recorder.visit_counts[1, 1:4].tolist(), [1, 1, 1])
+        self.assertEqual(self.recorder.visit_counts.sum(), 4)
+
+    def test_spill_to_disk(self):
+        """Test that every full window is saved before it's overwritten"""
+        with tempfile.TemporaryDirectory() as spill_dir:
+            self.recorder.spill_dir = spill_dir
+            self._record_all()
+            chunks = list(self.recorder.spilled_chunks())
+            self.assertEqual(len(chunks), 1)
+            start_tick, xs, _, _ = chunks[0]
+            self.assertEqual(start_tick, 0)
+            np.testing.assert_array_equal(xs[:, 0], [1, 2, 1, 2])
+
+if __name__ == '__main__':
+    unittest.main()
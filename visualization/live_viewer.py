@@ -0,0 +1,81 @@
+import sys
+import time
+import pygame
+from types import SimpleNamespace
+from maze.shared_maze import MazeSubscriber
+from visualization.maze_vis import MazeVisualizer
+
+"""
+Watch a simulation running in another process.
+
+Start the simulation with a 'publish_name' in its config (usually headless),
+then attach any number of viewers by that name:
+
+    python -m visualization.live_viewer <publish_name> [fps]
+
+Viewers only read the published shared memory, render at their own frame
+rate and can be closed at any time without affecting the run.
+"""
+
+class LiveViewer:
+    CELL_SIZE = 20
+
+    def __init__(self, name, fps=30):
+        self.subscriber = MazeSubscriber(name)
+        self.fps = fps
+        rows, cols = self.subscriber.grid.shape
+        self.visualizer = MazeVisualizer(cols * self.CELL_SIZE, rows * self.CELL_SIZE,
+                                         self.CELL_SIZE)
+        pygame.display.set_caption(f"Multi-Agent Pathfinding - {name}")
+        self.clock = pygame.time.Clock()
+
+    def _handle_events(self):
+        running = True
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    running = False
+        return running
+
+    def _draw(self, state):
+        """Draw a snapshot with the simulation's own visualizer."""
+        maze = SimpleNamespace(grid=state['grid'], pheromone_grid=state['pheromone_grid'])
+        goal_x, goal_y = self.subscriber.goal
+        agents = [SimpleNamespace(x=x, y=y, goal_x=goal_x, goal_y=goal_y,
+                                  temperature=state['temperature'])
+                  for x, y in state['agents']]
+        self.visualizer.draw(maze, agents, state['time_remaining'], state['finish_time'])
+
+    def run(self):
+        """Render until the window is closed or the run ends, then detach."""
+        last_tick = None
+        try:
+            while self._handle_events() and not self.subscriber.closed:
+                state = self.subscriber.snapshot()
+                # Only redraw when the simulation has moved on
+                if state is not None and state['tick'] != last_tick:
+                    self._draw(state)
+                    last_tick = state['tick']
+                self.clock.tick(self.fps)
+        finally:
+            self.subscriber.close()
+
+def main():
+    if len(sys.argv) < 2:
+        print("usage: python -m visualization.live_viewer <publish_name> [fps]")
+        sys.exit(1)
+    name = sys.argv[1]
+    fps = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    # Wait for the simulation to start publishing
+    while True:
+        try:
+            viewer = LiveViewer(name, fps)
+            break
+        except FileNotFoundError:
+            time.sleep(0.5)
+    viewer.run()
+
+if __name__ == "__main__":
+    main()
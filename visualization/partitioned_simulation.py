@@ -0,0 +1,254 @@
+import multiprocessing as mp
+import numpy as np
+from maze.dynamic_maze import DynamicMaze
+from maze.shared_maze import attach_shared_array, create_shared_array
+from visualization.simulation import Simulation
+
+"""
+Domain-decomposed stepping of one large maze across worker processes.
+
+The maze is cut into horizontal strips of rows, one per worker process.
+The grid, move mask and pheromone grid live in shared memory, so every
+worker maps the whole maze zero-copy but only writes its own strip. Each
+tick runs in barrier-separated phases:
+
+1. Wall changes, even strips first, then odd strips. Changing a wall reads
+   and patches the halo row just outside the strip, which the neighbors
+   leave alone while it happens.
+2. Pheromone evaporation of each worker's own rows.
+3. Agent moves against the grid as it stood at the start of the phase.
+   Deposits are buffered, and agents that step out of the strip are handed
+   to the neighbor owning their new row, together with their deposits.
+4. Each worker applies the deposits that landed in its own rows, so no two
+   processes ever write the same cell.
+
+Strips are fixed, equal row ranges, so only the per-cell work of phases 1,
+2 and 4 is split evenly. Agent moves are not: every agent spawns at the
+colony, inside one strip, and the swarm gathers again in the goal's strip
+once agents arrive. That worker steps most of the agents while the others
+only mutate walls and evaporate. On an 80x80 maze with 200 agents and 4
+strips, the busiest strip held all agents at spawn, about 55% while they
+spread out, and all of them again by tick 1000. Process startup and the
+barriers also cost a fixed amount per run and per tick, so this only pays
+off for large mazes on several cores: on one core, 300 ticks of that maze
+ran at 365 ticks/s in Simulation, against 333, 280 and 199 ticks/s with
+1, 2 and 4 workers.
+"""
+
+# Slots of the shared control array
+_STOP, _TICK = 0, 1
+
+class PartitionedSimulation(Simulation):
+    """Headless simulation of one maze split across worker processes.
+
+    Takes the same config as Simulation, with 'num_workers' setting the
+    number of strips (and processes). Agents always step synchronously,
+    each with its own random stream, so runs with the same 'seed' are
+    repeatable.
+    """
+    def __init__(self, config):
+        # the workers' agents never reach the publisher
+        if config.get('publish_name'):
+            raise ValueError("Publishing is not supported across workers")
+        super().__init__(dict(config, headless=True, synchronous=True))
+        # strips must be at least two rows tall so that the same-colored
+        # strips changing walls together never patch the same halo row
+        if self.grid_height < 2 * self.num_workers:
+            raise ValueError("Maze is too small for this many workers")
+        # the workers' mazes carry no hierarchy, and this one would go stale
+        if self.maze.hierarchy is not None:
+            raise ValueError("Cluster hierarchies are not supported across workers")
+        # nor a dead-end index, so pruning would silently do nothing
+        if self.maze.dead_ends is not None:
+            raise ValueError("Dead-end pruning is not supported across workers")
+        # elitist deposits span the whole path, across other workers' strips
+        if self.maze.pheromone_bounds is not None:
+            raise ValueError("MAX-MIN updates are not supported across workers")
+        # a corridor can run through several strips in one tick
+        if self.maze.junctions is not None:
+            raise ValueError("Junction moves are not supported across workers")
+        # the agents only move inside the worker processes
+        if self.trajectory is not None:
+            raise ValueError("Trajectory recording is not supported across workers")
+        # per-strip arrival counts, filled in by the workers during run()
+        self.arrived_counts = None
+
+    def _strip_bounds(self):
+        """(first_row, stop_row) of every worker's strip."""
+        strips = np.array_split(np.arange(self.grid_height), self.num_workers)
+        return [(int(rows[0]), int(rows[-1]) + 1) for rows in strips]
+
+    def _count_arrived(self):
+        """Number of agents on the goal, as reported by the workers."""
+        if self.arrived_counts is not None:
+            return int(self.arrived_counts.sum())
+        return super()._count_arrived()
+
+    def run(self):
+        """Step the maze in worker processes until a stop condition is met.
+
+        Returns the results() summary of the run.
+        """
+        context = mp.get_context()
+        specs = {
+            'grid': (self.maze.grid.shape, self.maze.grid.dtype),
+            'move_mask': (self.maze.move_mask.shape, self.maze.move_mask.dtype),
+            'pheromone_grid': (self.maze.pheromone_grid.shape, self.maze.pheromone_grid.dtype),
+            'control': ((2,), np.int64),
+            'arrived': ((self.num_workers,), np.int64),
+        }
+        segments = {}
+        arrays = {}
+        for key, (shape, dtype) in specs.items():
+            segments[key], arrays[key] = create_shared_array(shape, dtype)
+        names = {key: (segments[key].name, shape, dtype) for key, (shape, dtype) in specs.items()}
+
+        # The main process works on the shared arrays too
+        for key in ('grid', 'move_mask', 'pheromone_grid'):
+            arrays[key][:] = getattr(self.maze, key)
+            setattr(self.maze, key, arrays[key])
+        control = arrays['control']
+        self.arrived_counts = arrays['arrived']
+
+        # Hand each agent to the worker owning its row
+        bounds = self._strip_bounds()
+        owned = [[] for _ in bounds]
+        for agent_id, agent in enumerate(self.agents):
+            for index, (y_start, y_stop) in enumerate(bounds):
+                if y_start <= agent.y < y_stop:
+                    owned[index].append((agent_id, agent))
+
+        seed = self.config.get('seed', np.random.randint(2**31))
+        maze_seeds = [int(s.generate_state(1)[0])
+                      for s in np.random.SeedSequence(seed).spawn(self.num_workers)]
+        tick_barrier = context.Barrier(self.num_workers + 1)
+        phase_barrier = context.Barrier(self.num_workers)
+        inboxes = [context.Queue() for _ in bounds]
+        finished = context.Queue()
+        workers = [
+            context.Process(
+                target=_strip_worker,
+                args=(index, bounds, names, owned[index], self.config, maze_seeds[index],
+                      tick_barrier, phase_barrier, inboxes, finished),
+                daemon=True)
+            for index in range(self.num_workers)
+        ]
+        for worker in workers:
+            worker.start()
+
+        try:
+            self.start_time = 0
+            while True:
+                self.time_remaining = max(0, self.config['simulation_time'] - self._elapsed_seconds())
+                control[_TICK] = self.frame_count
+                tick_barrier.wait()  # start of tick
+                tick_barrier.wait()  # workers are done with it
+
+                if self.finish_time is None and self._count_arrived() > 0:
+                    self.finish_time = self._elapsed_seconds()
+                    self.finish_tick = self.frame_count
+                if 'converged' in self.stop_on and self.finish_tick is not None:
+                    self.trail_changed = True  # the workers moved agents
+                    self._update_best_path()
+                self.frame_count += 1
+
+                self.stop_reason = self._check_stop()
+                if self.stop_reason is not None:
+                    break
+
+            control[_STOP] = 1
+            tick_barrier.wait()
+            agents = []
+            for _ in workers:
+                agents.extend(finished.get())
+            self.agents = [agent for _, agent in sorted(agents, key=lambda item: item[0])]
+            for worker in workers:
+                worker.join()
+        finally:
+            # Keep private copies so results() works after the segments are gone
+            for key in ('grid', 'move_mask', 'pheromone_grid'):
+                setattr(self.maze, key, arrays[key].copy())
+            self.arrived_counts = arrays['arrived'].copy()
+            del control
+            arrays.clear()
+            for segment in segments.values():
+                segment.close()
+                segment.unlink()
+
+        return self.results()
+
+def _strip_worker(index, bounds, names, agents, config, maze_seed,
+                  tick_barrier, phase_barrier, inboxes, finished):
+    """Process body: own the rows bounds[index] and the agents inside them."""
+    segments = {}
+    arrays = {}
+    for key, (name, shape, dtype) in names.items():
+        segments[key], arrays[key] = attach_shared_array(name, shape, dtype)
+    maze = DynamicMaze.from_arrays(arrays['grid'], arrays['pheromone_grid'], arrays['move_mask'],
+                                   config['wall_change_probability'], maze_seed)
+    control = arrays['control']
+    y_start, y_stop = bounds[index]
+    neighbors = [n for n in (index - 1, index + 1) if 0 <= n < len(bounds)]
+
+    try:
+        while True:
+            tick_barrier.wait()
+            if control[_STOP]:
+                break
+            tick = int(control[_TICK])
+
+            # Phases 1 and 2: wall changes by color, then evaporation
+            if tick % config['wall_change_interval'] == 0:
+                for color in (0, 1):
+                    if index % 2 == color:
+                        maze.mutate_walls(y_start, y_stop)
+                    phase_barrier.wait()
+                maze.pheromone_grid[y_start:y_stop] *= maze.evaporation_rate
+                phase_barrier.wait()
+
+            # Phase 3: move agents, sorting them (and deposits) by new owner
+            time_remaining = max(0, config['simulation_time'] -
+                                 tick / config.get('sim_rate', config['fps']))
+            staying, deposits = [], []
+            leaving = {n: ([], []) for n in neighbors}
+            for agent_id, agent in agents:
+                agent_deposits = []
+                agent.move(maze, [], time_remaining, agent_deposits)
+                if agent.y < y_start:
+                    owner = index - 1
+                elif agent.y >= y_stop:
+                    owner = index + 1
+                else:
+                    staying.append((agent_id, agent))
+                    deposits.extend(agent_deposits)
+                    continue
+                leaving[owner][0].append((agent_id, agent))
+                leaving[owner][1].extend(agent_deposits)
+            phase_barrier.wait()
+
+            # Phase 4: swap handoffs with neighbors and apply our deposits
+            for n in neighbors:
+                inboxes[n].put((index, leaving[n]))
+            received = sorted((inboxes[index].get() for _ in neighbors), key=lambda item: item[0])
+            agents = staying
+            for _, (arrivals, arrival_deposits) in received:
+                agents.extend(arrivals)
+                deposits.extend(arrival_deposits)
+            if deposits:
+                ys, xs, strengths = (np.array(column) for column in zip(*deposits))
+                np.add.at(maze.pheromone_grid, (ys, xs), strengths)
+
+            arrays['arrived'][index] = sum(1 for _, agent in agents
+                                           if agent.x == agent.goal_x and agent.y == agent.goal_y)
+            tick_barrier.wait()
+    except Exception:
+        # Don't leave the other processes waiting on us forever
+        tick_barrier.abort()
+        phase_barrier.abort()
+        raise
+
+    finished.put(agents)
+    del maze, control
+    arrays.clear()
+    for segment in segments.values():
+        segment.close()
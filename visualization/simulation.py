@@ -1,12 +1,28 @@
 import pygame
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from visualization.maze_vis import MazeVisualizer
 from agents.agent import Agent
+from agents.aco import ACOBehavior
+from agents.baselines import AStarAgent, BFSAgent, WallFollowerAgent
+from agents.trajectory import TrajectoryRecorder
 from maze.dynamic_maze import DynamicMaze
+from maze.dead_ends import DeadEndIndex
+from maze.hierarchy import ClusterHierarchy
+from maze.junction_graph import JunctionGraph
+from maze.maze_cache import MazeCache
+from maze.shared_maze import MazePublisher
 
 class Simulation:
     # Constants
     CELL_SIZE = 20  # Fixed cell size for consistent visualization
+    STOP_CONDITIONS = ('first_arrival', 'all_arrived', 'converged')
+    AGENT_TYPES = {
+        'aco': Agent,
+        'bfs': BFSAgent,
+        'astar': AStarAgent,
+        'wall_follower': WallFollowerAgent,
+    }
 
     def __init__(self, config=None):
         # default configuration
@@ -21,6 +37,19 @@ class Simulation:
             }
         else:
             self.config = config
+            
+        # Optional run control - headless runs never open a window
+        self.headless = self.config.get('headless', False)
+        stop_on = self.config.get('stop_on', ())
+        self.stop_on = (stop_on,) if isinstance(stop_on, str) else tuple(stop_on)
+        for condition in self.stop_on:
+            if condition not in self.STOP_CONDITIONS:
+                raise ValueError(f"Unknown stop condition: {condition}")
+                
+        # Synchronous stepping: agents all see the previous tick's state
+        self.synchronous = self.config.get('synchronous', False)
+        self.num_workers = self.config.get('num_workers', 1)
+        self.executor = None
 
         # Initialize components
         self._init_simulation()
@@ -31,21 +60,80 @@ class Simulation:
         self.grid_height = height * 2 + 1
         
         # Create maze and visualization
-        self.maze = DynamicMaze(width, height, self.config['wall_change_probability'])
-        self.maze.generate()
+        if self.config.get('maze_cache'):
+            # cached grids are keyed by seed, so always use one
+            maze_seed = self.config.get('maze_seed')
+            if maze_seed is None:
+                maze_seed = np.random.randint(2**31)
+            self.maze = DynamicMaze(width, height, self.config['wall_change_probability'],
+                                    seed=maze_seed)
+            cache = MazeCache(self.config['maze_cache'],
+                              self.config.get('maze_cache_bytes', 256 * 2**20))
+            self.maze.load_grid(cache.load(width, height, seed=maze_seed))
+        else:
+            self.maze = DynamicMaze(width, height, self.config['wall_change_probability'],
+                                    seed=self.config.get('maze_seed'))
+            self.maze.generate()
         
-        window_width = self.grid_width * self.CELL_SIZE
-        window_height = self.grid_height * self.CELL_SIZE
-        self.visualizer = MazeVisualizer(window_width, window_height, self.CELL_SIZE)
+        self.visualizer = None
+        self.clock = None
+        if not self.headless:
+            window_width = self.grid_width * self.CELL_SIZE
+            window_height = self.grid_height * self.CELL_SIZE
+            self.visualizer = MazeVisualizer(window_width, window_height, self.CELL_SIZE)
+            self.clock = pygame.time.Clock()
         
         # Initialize agents and timing
         self.goal_pos = self._select_goal()
         self.agents = self._create_agents()
-        self.clock = pygame.time.Clock()
-        self.frame_count = 0
+        if self.synchronous:
+            self._seed_agents()
+        self.frame_count = 0  # logical ticks run so far
         self.time_remaining = self.config['simulation_time']
         self.finish_time = None
+        self.finish_tick = None
         self.start_time = None
+        
+        # Optional coarse guidance for large mazes
+        if self.config.get('cluster_size'):
+            self.maze.hierarchy = ClusterHierarchy(self.maze, self.goal_pos,
+                                                   self.config['cluster_size'])
+        # Optionally fill in dead ends so agents stay out of them
+        if self.config.get('prune_dead_ends'):
+            self.maze.dead_ends = DeadEndIndex(self.maze, protected=[self.colony_pos, self.goal_pos])
+        # Optionally let agents take whole corridors per tick. A corridor
+        # of any length then costs one tick, so tick counts are no longer
+        # comparable to single-cell runs; compare cells walked instead.
+        if self.config.get('junction_moves'):
+            self.maze.junctions = JunctionGraph(self.maze, protected=[self.colony_pos, self.goal_pos])
+        
+        # MAX-MIN Ant System keeps the trail bounded. Trails start at the
+        # bottom rather than the top: evaporation only runs once per wall
+        # change, so a full grid would hide every deposit for hundreds of ticks.
+        aco = ACOBehavior(self.config.get('aco'))
+        self.maze.pheromone_bounds = aco.pheromone_bounds()
+        if self.maze.pheromone_bounds is not None:
+            self.maze.pheromone_grid[:] = self.maze.pheromone_bounds[0]
+        self.stagnation_reset_ticks = (aco.config['stagnation_reset_ticks']
+                                       if self.maze.pheromone_bounds is not None else None)
+        self.trail_resets = 0
+        
+        # Optionally record agent trajectories for analysis
+        self.trajectory = None
+        if self.config.get('trajectory_window'):
+            self.trajectory = TrajectoryRecorder(
+                len(self.agents), self.maze.grid.shape, self.config['trajectory_window'],
+                goal=self.goal_pos, spill_dir=self.config.get('trajectory_spill_dir'))
+        
+        # Optionally share state with viewers in other processes; the
+        # shared memory only exists while run() is running
+        self.publisher = None
+        
+        # Convergence tracking
+        self.best_path = []
+        self.best_path_stable_ticks = 0
+        self.trail_changed = True  # pheromone changed since best_path was extracted
+        self.stop_reason = None
 
     def _select_goal(self):
         empty_cells = []
@@ -76,6 +164,7 @@ class Simulation:
                     colony_cells.append((x, y))
         
         colony_pos = colony_cells[np.random.randint(len(colony_cells))]
+        self.colony_pos = colony_pos
         
         # Combine agent and ACO configs
         agent_config = {
@@ -88,14 +177,23 @@ class Simulation:
         if 'aco' in self.config:
             agent_config['aco'] = self.config['aco']
         
+        agent_class = self.AGENT_TYPES[self.config.get('agent_type', 'aco')]
         for _ in range(self.config['num_agents']):
-            agent = Agent(colony_pos[0], colony_pos[1], 
+            agent = agent_class(colony_pos[0], colony_pos[1], 
                          self.goal_pos[0], self.goal_pos[1],
                          config=agent_config)
             agents.append(agent)
         
         return agents
 
+    def _seed_agents(self):
+        """Give each agent its own random stream so results don't depend
+        on which worker steps it."""
+        seed = self.config.get('seed', np.random.randint(2**31))
+        streams = np.random.SeedSequence(seed).spawn(len(self.agents))
+        for agent, stream in zip(self.agents, streams):
+            agent.rng = np.random.RandomState(np.random.MT19937(stream))
+
     def _handle_events(self):
         running = True
         for event in pygame.event.get():
@@ -106,42 +204,231 @@ class Simulation:
                     running = False
         return running
 
+    def _sim_rate(self):
+        """Logical ticks per simulated second."""
+        return self.config.get('sim_rate', self.config['fps'])
+
+    def _elapsed_seconds(self):
+        """Simulated seconds since the run started, counted in logical ticks."""
+        return self.frame_count / self._sim_rate()
+
+    def _update_best_path(self):
+        """Re-extract the best path if the trail changed, and count how
+        long it has been stable."""
+        if self.trail_changed:
+            path = self.maze.extract_best_path(self.colony_pos, self.goal_pos)
+            self.trail_changed = False
+        else:
+            path = self.best_path
+        if path and path == self.best_path:
+            self.best_path_stable_ticks += 1
+        else:
+            self.best_path_stable_ticks = 0
+        self.best_path = path
+
+    def _reset_trail(self):
+        """Wipe a stagnated trail back to its lower bound, so agents explore again."""
+        self.maze.pheromone_grid[:] = self.maze.pheromone_bounds[0]
+        self.best_path_stable_ticks = 0
+        self.trail_changed = True
+        self.trail_resets += 1
+
+    def _check_stop(self):
+        """Return the reason the run should stop, or None to keep going."""
+        arrived = self._count_arrived()
+        if 'first_arrival' in self.stop_on and arrived > 0:
+            return 'first_arrival'
+        if 'all_arrived' in self.stop_on and arrived == self.config['num_agents']:
+            return 'all_arrived'
+        if ('converged' in self.stop_on and
+                self.best_path_stable_ticks >= self.config.get('convergence_ticks', 50)):
+            return 'converged'
+        max_ticks = self.config.get('max_ticks')
+        if max_ticks is not None and self.frame_count >= max_ticks:
+            return 'tick_budget'
+        # Headless runs have no window to close, so they end when time is up
+        if self.headless and self.time_remaining <= 0:
+            return 'time_up'
+        return None
+
+    def _count_arrived(self):
+        """Number of agents currently on the goal."""
+        return sum(1 for agent in self.agents
+                   if agent.x == agent.goal_x and agent.y == agent.goal_y)
+
+    def results(self):
+        """Summarize the run, including the current best pheromone path."""
+        best_path = self.maze.extract_best_path(self.colony_pos, self.goal_pos)
+        return {
+            'ticks': self.frame_count,
+            'finish_time': self.finish_time,
+            'finish_tick': self.finish_tick,
+            'arrived': self._count_arrived(),
+            'best_path': best_path,
+            'best_path_length': len(best_path) - 1 if best_path else None,
+            'stop_reason': self.stop_reason,
+            'trail_resets': self.trail_resets,
+        }
+
     def _update_simulation(self):
         # Update maze periodically
         if self.frame_count % self.config['wall_change_interval'] == 0:
             self.maze.update()
+            self.trail_changed = True
         
         # Update agents
         self.maze.agents = self.agents
+        if self.synchronous:
+            self._step_agents_synchronous()
+        else:
+            for agent in self.agents:
+                agent.move(self.maze, self.agents, self.time_remaining)
+        # only agents that moved can have left pheromone
+        if any(agent.vx or agent.vy for agent in self.agents):
+            self.trail_changed = True
+                
+        if self.trajectory is not None:
+            self.trajectory.record_agents(self.agents)
+                
+        # Check if any agent reached the goal
         for agent in self.agents:
-            agent.move(self.maze, self.agents, self.time_remaining)
-            # Check if any agent reached the goal
             if agent.x == agent.goal_x and agent.y == agent.goal_y:
                 if self.finish_time is None:  # Only record first finish
-                    elapsed = (pygame.time.get_ticks() - self.start_time) / 1000
-                    self.finish_time = elapsed
+                    self.finish_time = self._elapsed_seconds()
+                    self.finish_tick = self.frame_count
+
+        # Track convergence of the pheromone trail once there is one to follow
+        if (('converged' in self.stop_on or self.stagnation_reset_ticks) and
+                self.finish_tick is not None):
+            self._update_best_path()
+            if (self.stagnation_reset_ticks and
+                    self.best_path_stable_ticks >= self.stagnation_reset_ticks):
+                self._reset_trail()
 
         # Increment frame count
         self.frame_count += 1
 
-    def run(self):
-        running = True
-        self.start_time = pygame.time.get_ticks()
+    def _step_agents_synchronous(self):
+        """Move all agents against the pheromone grid as it was at the start
+        of the tick, then apply everyone's deposits at once.
+        
+        Deposits go to per-slice buffers and are merged in agent order, so
+        the outcome is the same for any number of workers.
+        """
+        slices = [s for s in np.array_split(np.arange(len(self.agents)), self.num_workers)
+                  if len(s)]
         
-        while running:
-            # Handle timing
-            current_time = pygame.time.get_ticks()
-            elapsed_seconds = (current_time - self.start_time) / 1000
-            self.time_remaining = max(0, self.config['simulation_time'] - elapsed_seconds)
+        def step_slice(indices):
+            deposits = []
+            for i in indices:
+                self.agents[i].move(self.maze, self.agents, self.time_remaining, deposits)
+            return deposits
             
-            # Handle events
-            running = self._handle_events()
+        if self.num_workers > 1:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.num_workers)
+            buffers = list(self.executor.map(step_slice, slices))
+        else:
+            buffers = [step_slice(indices) for indices in slices]
             
-            # Update simulation
-            self._update_simulation()
+        # Merge the deposit buffers into the grid for the next tick
+        deposits = [d for buffer in buffers for d in buffer]
+        if deposits:
+            ys, xs, strengths = (np.array(column) for column in zip(*deposits))
+            np.add.at(self.maze.pheromone_grid, (ys, xs), strengths)
+            if self.maze.hierarchy is not None:
+                self.maze.hierarchy.deposit(ys, xs, strengths)
+            if self.maze.pheromone_bounds is not None:
+                self.maze.pheromone_grid[ys, xs] = np.clip(self.maze.pheromone_grid[ys, xs],
+                                                           *self.maze.pheromone_bounds)
+
+    def _step(self):
+        """Advance the simulation by one logical tick.
+        
+        Returns False once a stop condition is met.
+        """
+        self.time_remaining = max(0, self.config['simulation_time'] - self._elapsed_seconds())
+        self._update_simulation()
+        
+        # Stop as soon as the answer is known
+        self.stop_reason = self._check_stop()
+        
+        # Share the new state with any attached viewers
+        if (self.publisher is not None and
+                self.frame_count % self.config.get('publish_interval', 1) == 0):
+            self.publisher.publish(self.maze, self.agents, self.frame_count,
+                                   self.time_remaining, self.finish_time)
+        return self.stop_reason is None
+
+    def run(self):
+        """Run until the window is closed or a stop condition is met.
+        
+        The simulation advances in fixed logical ticks at 'sim_rate' ticks
+        per second of real time (default: 'fps'), independent of how often
+        the window is drawn. Each frame runs as many ticks as have come due,
+        up to 'max_steps_per_frame'. When it still falls behind, up to
+        'max_frame_skip' frames in a row skip drawing to catch up.
+        
+        Returns the results() summary of the run.
+        """
+        running = True
+        self.start_time = 0 if self.headless else pygame.time.get_ticks()
+        
+        # Always release the thread pool and shared memory, even if the
+        # run is interrupted
+        try:
+            if self.config.get('publish_name'):
+                self.publisher = MazePublisher(self.config['publish_name'], self.maze.grid.shape,
+                                               len(self.agents), self.goal_pos)
+            if self.headless:
+                while running:
+                    running = self._step()
+            else:
+                sim_rate = self._sim_rate()
+                max_steps = self.config.get('max_steps_per_frame',
+                                            4 * max(1, int(np.ceil(sim_rate / self.config['fps']))))
+                max_skip = self.config.get('max_frame_skip', 5)
+                accumulator = 0.0    # ticks that have come due but not run yet
+                frames_skipped = 0
+                last_time = self.start_time
             
-            # Draw current state
-            self.visualizer.draw(self.maze, self.agents, self.time_remaining, self.finish_time)
+                while running:
+                    # Handle events
+                    running = self._handle_events()
+                
+                    # Run every tick that has come due since the last frame
+                    now = pygame.time.get_ticks()
+                    accumulator += (now - last_time) / 1000 * sim_rate
+                    last_time = now
+                    steps = 0
+                    while running and accumulator >= 1 and steps < max_steps:
+                        running = self._step()
+                        accumulator -= 1
+                        steps += 1
+                    
+                    # Skip drawing while behind, but never for too long, and
+                    # don't let the backlog snowball
+                    behind = accumulator >= 1
+                    accumulator = min(accumulator, max_steps * (max_skip + 1))
+                    if behind and frames_skipped < max_skip:
+                        frames_skipped += 1
+                    else:
+                        # Draw current state
+                        self.visualizer.draw(self.maze, self.agents, self.time_remaining, self.finish_time)
+                        frames_skipped = 0
+                
+                    # Control frame rate
+                    self.clock.tick(self.config['fps'])
             
-            # Control frame rate
-            self.clock.tick(self.config['fps']) 
\ No newline at end of file
+        finally:
+            self._release()
+        return self.results()
+
+    def _release(self):
+        """Shut down the worker threads and unlink any shared memory."""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+        if self.publisher is not None:
+            self.publisher.close()
+            self.publisher = None 
\ No newline at end of file